@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import itertools
+import math
+import operator
+from array import array
+from typing import Iterable
+
+# Host-side typed numeric arrays for `stdlib/array` (`FloatArray`/`IntArray`).
+#
+# Arrays are `array.array` buffers: typecode "d" (float64) for FloatArray and
+# "q" (signed 64-bit) for IntArray. They are never mutated after creation, so
+# they can be shared freely as Flavent values. Loops run in C through
+# `map`/`sum`/`itertools`; float sums use `math.fsum` (exactly rounded).
+# Int `/` floors like the Flavent operator.
+
+FLOAT = "d"
+INT = "q"
+
+INT_MIN = -(1 << 63)
+INT_MAX = (1 << 63) - 1
+OUT_OF_RANGE = "array: value out of 64-bit range"
+
+_KINDS = {"float": FLOAT, "int": INT}
+
+_OPS = {
+    "+": operator.add,
+    "-": operator.sub,
+    "*": operator.mul,
+}
+
+
+def typecode(kind: str) -> str:
+    code = _KINDS.get(kind)
+    if code is None:
+        raise ValueError(f"array: unknown kind: {kind}")
+    return code
+
+
+def _new(code: str, xs: Iterable[float | int]) -> array:
+    try:
+        return array(code, xs)
+    except OverflowError:
+        raise ValueError(OUT_OF_RANGE) from None
+
+
+def empty(code: str) -> array:
+    return array(code)
+
+
+def from_values(code: str, xs: Iterable[float | int]) -> array:
+    if code == FLOAT:
+        return _new(code, (float(x) for x in xs))
+    return _new(code, xs)
+
+
+def fill(code: str, n: int, x: float | int) -> array:
+    return from_values(code, [x]) * max(0, n)
+
+
+def int_range(start: int, end: int) -> array:
+    return _new(INT, range(start, max(start, end)))
+
+
+def get(a: array, i: int) -> tuple[bool, float | int]:
+    if 0 <= i < len(a):
+        return True, a[i]
+    return False, 0
+
+
+def zip_with(a: array, b: array, op: str) -> array:
+    """Elementwise `a op b`; raises ValueError on mismatched lengths or `/ 0`."""
+    if len(a) != len(b):
+        raise ValueError(f"array: length mismatch: {len(a)} vs {len(b)}")
+    if op == "/":
+        if 0 in b:
+            raise ValueError("array: division by zero")
+        fn = operator.truediv if a.typecode == FLOAT else operator.floordiv
+    else:
+        fn = _OPS.get(op)
+        if fn is None:
+            raise ValueError(f"array: unknown operator: {op}")
+    return _new(a.typecode, map(fn, a, b))
+
+
+def scalar(a: array, op: str, x: float | int) -> array:
+    fn = _OPS.get(op)
+    if fn is None:
+        raise ValueError(f"array: unknown operator: {op}")
+    if a.typecode == FLOAT:
+        x = float(x)
+    return _new(a.typecode, map(fn, a, itertools.repeat(x)))
+
+
+def total(a: array) -> float | int:
+    return math.fsum(a) if a.typecode == FLOAT else sum(a)
+
+
+def mean(a: array) -> float:
+    """Arithmetic mean; 0.0 for an empty array (like `statistics.mean`)."""
+    if not a:
+        return 0.0
+    if a.typecode == FLOAT:
+        return math.fsum(a) / len(a)
+    return sum(a) / len(a)
+
+
+def variance(a: array) -> float:
+    """Population variance; 0.0 for an empty array."""
+    n = len(a)
+    if not n:
+        return 0.0
+    m = mean(a)
+    return math.fsum((x - m) * (x - m) for x in a) / n
+
+
+def cumsum(a: array) -> array:
+    return _new(a.typecode, itertools.accumulate(a))
+
+
+def to_float(a: array) -> array:
+    return a if a.typecode == FLOAT else _new(FLOAT, map(float, a))
+
+
+def histogram(a: array, lo: float, hi: float, bins: int) -> array:
+    """Counts per equal-width bin over `[lo, hi]`; values outside are skipped.
+
+    Bins are half-open except the last, which also counts `hi`.
+    """
+    if bins <= 0:
+        raise ValueError("array: bins must be positive")
+    if not lo < hi:
+        raise ValueError("array: empty histogram range")
+    counts = [0] * bins
+    scale = bins / (hi - lo)
+    last = bins - 1
+    for x in a:
+        if lo <= x <= hi:
+            k = int((x - lo) * scale)
+            counts[k if k < last else last] += 1
+    return array(INT, counts)
+
+
+__all__ = [
+    "FLOAT",
+    "INT",
+    "INT_MAX",
+    "INT_MIN",
+    "OUT_OF_RANGE",
+    "cumsum",
+    "empty",
+    "fill",
+    "from_values",
+    "get",
+    "histogram",
+    "int_range",
+    "mean",
+    "scalar",
+    "to_float",
+    "total",
+    "typecode",
+    "variance",
+    "zip_with",
+]
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import binascii
+import re
+
+# Host-side base64 for `stdlib/base64` (standard and URL-safe alphabets).
+#
+# Encoding always pads. Decoding has two modes:
+# - lenient (`decode`, `urlsafeDecode`): characters outside the alphabet are
+#   skipped, padding is optional, and each `=` run ends a group, so padded
+#   pieces can be concatenated ("aGk=aGk=" -> b"hihi"); never fails
+# - strict (`decodeChecked`, the streaming decoder): ASCII whitespace is
+#   skipped, padding is optional but must be correct when present, and nothing
+#   may follow it; anything else raises ValueError("invalid base64")
+#
+# The streaming functions carry the unfinished 3-byte / 4-char group between
+# chunks, so concatenating their output gives the one-shot result.
+
+_CANONICAL = re.compile(r"(?:[A-Za-z0-9+/]{4})*(?:[A-Za-z0-9+/]{2}==|[A-Za-z0-9+/]{3}=)?")
+_STRICT = re.compile(r"(?:[A-Za-z0-9+/]{4})*(?:[A-Za-z0-9+/]{2}(?:==)?|[A-Za-z0-9+/]{3}=?)?")
+# Final group still waiting for the rest of its padding.
+_PAD_PENDING = re.compile(r"[A-Za-z0-9+/]{2}={0,2}|[A-Za-z0-9+/]{3}=?")
+_DIGITS = re.compile(r"[A-Za-z0-9+/]*")
+_NOT_STD = re.compile(r"[^A-Za-z0-9+/=]")
+_PAD_RUN = re.compile(r"=+")
+_SPACE = re.compile(r"[ \t\r\n]")
+
+# URL-safe input is mapped onto the standard alphabet; the standard-only
+# characters become "!" so both modes reject or skip them.
+_FROM_URL = str.maketrans({"-": "+", "_": "/", "+": "!", "/": "!"})
+_TO_URL = bytes.maketrans(b"+/", b"-_")
+
+
+def _to_std(s: str, url: bool) -> str:
+    return s.translate(_FROM_URL) if url else s
+
+
+def encode(b: bytes, url: bool) -> str:
+    out = binascii.b2a_base64(b, newline=False)
+    if url:
+        out = out.translate(_TO_URL)
+    return out.decode("ascii")
+
+
+def _decode_group(s: str) -> bytes:
+    if len(s) % 4 == 1:
+        s = s[:-1]
+    return binascii.a2b_base64(s + "=" * (-len(s) % 4))
+
+
+def decode(s: str, url: bool) -> bytes:
+    s = _to_std(s, url)
+    if len(s) % 4 == 0 and _CANONICAL.fullmatch(s):
+        return binascii.a2b_base64(s)
+    s = _NOT_STD.sub("", s)
+    return b"".join(_decode_group(g) for g in _PAD_RUN.split(s) if g)
+
+
+def decode_strict(s: str, url: bool) -> bytes:
+    s = _SPACE.sub("", _to_std(s, url))
+    if not _STRICT.fullmatch(s):
+        raise ValueError("invalid base64")
+    return _decode_group(s)
+
+
+def encode_chunk(pending: bytes, chunk: bytes, url: bool, final: bool) -> tuple[str, bytes]:
+    """Encodes every complete 3-byte group; returns (text, leftover bytes)."""
+    data = pending + chunk
+    k = len(data) if final else len(data) - len(data) % 3
+    return encode(data[:k], url), data[k:]
+
+
+def decode_chunk(pending: str, chunk: str, url: bool, final: bool) -> tuple[bytes, str]:
+    """Strictly decodes every complete group; returns (bytes, leftover text).
+
+    `pending` is the leftover from the previous call, already normalized.
+    """
+    data = pending + _SPACE.sub("", _to_std(chunk, url))
+    p = data.find("=")
+    k = len(data) - len(data) % 4 if p < 0 else p - p % 4
+    head, tail = data[:k], data[k:]
+    if not _STRICT.fullmatch(head):
+        raise ValueError("invalid base64")
+    out = binascii.a2b_base64(head)
+    if final:
+        return out + decode_strict(tail, False), ""
+    if not (_PAD_PENDING if p >= 0 else _DIGITS).fullmatch(tail):
+        raise ValueError("invalid base64")
+    return out, tail
+
+
+__all__ = [
+    "decode",
+    "decode_chunk",
+    "decode_strict",
+    "encode",
+    "encode_chunk",
+]
@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+from typing import Iterable
+
+# Host-side byte helpers for `stdlib/bytelib`.
+#
+# `BytesView` is a window `[start, end)` over immutable `bytes`: slicing a view
+# is O(1) and shares the buffer, and searches run on the buffer in place.
+# Indexes are clamped like `_pyBytesSlice` (no negative indexing from the end).
+#
+# `ByteBuf` backs `bytelib.ByteBuffer` with the same ownership scheme as
+# `string_host.StrBuilder`: buffers are values, and an append writes into the
+# shared `bytearray` in place when the buffer is the newest view of it (the
+# usual linear use, amortized O(1)) and copies the used prefix otherwise.
+
+
+def _clamp(n: int, i: int) -> int:
+    return max(0, min(n, i))
+
+
+class BytesView:
+    __slots__ = ("_data", "_start", "_end")
+
+    def __init__(self, data: bytes, start: int, end: int) -> None:
+        self._data = data
+        self._start = start
+        self._end = end
+
+    def __len__(self) -> int:
+        return self._end - self._start
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, BytesView):
+            return NotImplemented
+        return self.memory() == other.memory()
+
+    def __hash__(self) -> int:
+        return hash(self.to_bytes())
+
+    def __repr__(self) -> str:
+        return f"BytesView({self.to_bytes()!r})"
+
+    def memory(self) -> memoryview:
+        """Zero-copy view of the window."""
+        return memoryview(self._data)[self._start : self._end]
+
+    def get(self, i: int) -> int:
+        if i < 0 or i >= len(self):
+            return 0
+        return self._data[self._start + i]
+
+    def slice(self, start: int, end: int) -> BytesView:
+        n = len(self)
+        a = _clamp(n, start)
+        return BytesView(self._data, self._start + a, self._start + max(a, _clamp(n, end)))
+
+    def find(self, needle: bytes, start: int) -> int:
+        """Offset of `needle` at or after `start` within the view, else -1."""
+        if not needle:
+            return start
+        i = self._data.find(needle, self._start + max(0, start), self._end)
+        return i - self._start if i >= 0 else -1
+
+    def to_bytes(self) -> bytes:
+        if self._start == 0 and self._end == len(self._data):
+            return self._data
+        return self._data[self._start : self._end]
+
+
+def view(b: bytes) -> BytesView:
+    data = bytes(b)
+    return BytesView(data, 0, len(data))
+
+
+class ByteBuf:
+    __slots__ = ("_data", "_size")
+
+    def __init__(self, data: bytearray, size: int) -> None:
+        self._data = data
+        self._size = size
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, ByteBuf):
+            return NotImplemented
+        return self.freeze() == other.freeze()
+
+    def __hash__(self) -> int:
+        return hash(self.freeze())
+
+    def __repr__(self) -> str:
+        return f"ByteBuf({self.freeze()!r})"
+
+    def _owned(self) -> bytearray:
+        if len(self._data) == self._size:
+            return self._data
+        return self._data[: self._size]
+
+    def append(self, b: bytes | memoryview) -> ByteBuf:
+        """Appends `b` (a `BytesView` is passed as its `memory()`)."""
+        if not len(b):
+            return self
+        data = self._owned()
+        data += b
+        return ByteBuf(data, len(data))
+
+    def append_all(self, xs: Iterable[bytes | memoryview]) -> ByteBuf:
+        data = self._owned()
+        for x in xs:
+            data += x
+        if len(data) == self._size:
+            return self
+        return ByteBuf(data, len(data))
+
+    def push(self, x: int) -> ByteBuf:
+        data = self._owned()
+        data.append(x & 0xFF)
+        return ByteBuf(data, len(data))
+
+    def push_all(self, xs: Iterable[int]) -> ByteBuf:
+        data = self._owned()
+        data.extend(x & 0xFF for x in xs)
+        if len(data) == self._size:
+            return self
+        return ByteBuf(data, len(data))
+
+    def freeze(self) -> bytes:
+        return bytes(memoryview(self._data)[: self._size])
+
+
+def new_buffer() -> ByteBuf:
+    return ByteBuf(bytearray(), 0)
+
+
+__all__ = [
+    "ByteBuf",
+    "BytesView",
+    "new_buffer",
+    "view",
+]
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import argparse
+import dataclasses
 import json
 import xml.etree.ElementTree as ET
 from pathlib import Path
@@ -15,6 +16,7 @@ from .resolve import resolve_program_with_stdlib
 from .lower import lower_resolved
 from .hir import node_to_dict as hir_to_dict
 from .reporting import ReportIssue, build_report
+from .runtime import DEFAULT_MAX_STEPS, DEFAULT_PREEMPT_BUDGET, RuntimeStats, parse_named_int, parse_queue_limit
 from .typecheck import check_program
 
 
@@ -47,6 +49,56 @@ def _write_junit_report(
     ET.ElementTree(suite).write(out_path, encoding="utf-8", xml_declaration=True)
 
 
+def _non_negative_int(s: str) -> int:
+    n = int(s)
+    if n < 0:
+        raise argparse.ArgumentTypeError(f"must be >= 0: {s}")
+    return n
+
+
+def _run_tests(args: argparse.Namespace) -> int:
+    # flvtest imports the compiler, so load it only for this command.
+    from flvtest.runner import discover_cases, run_file
+
+    try:
+        queue_limits = dict(parse_queue_limit(s) for s in args.queue_limit)
+        event_priorities = dict(parse_named_int(s, "event priority") for s in args.event_priority)
+        sector_weights = dict(parse_named_int(s, "sector weight") for s in args.sector_weight)
+        batch_sizes = dict(parse_named_int(s, "batch size") for s in args.batch)
+    except ValueError as e:
+        print(f"UsageError: {e}")
+        return 2
+
+    path = Path(args.file)
+    cases: list[str | None] = [args.case] if args.case else list(discover_cases(path.read_text(encoding="utf-8")))
+    if not cases:
+        cases = [None]
+    failed = 0
+    for case in cases:
+        name = path.name if case is None else f"{path.name}::{case}"
+        stats = RuntimeStats() if args.stats else None
+        res = run_file(
+            path,
+            case=case,
+            queue_limits=queue_limits,
+            event_priorities=event_priorities,
+            sector_weights=sector_weights,
+            batch_sizes=batch_sizes,
+            stats=stats,
+            preempt_budget=args.preempt_budget or None,
+            max_steps=args.max_steps or None,
+            handler_step_budget=args.handler_step_budget or None,
+        )
+        if res.ok:
+            print(f"PASS {name}")
+        else:
+            failed += 1
+            print(f"FAIL {name}: {res.error}")
+        if stats is not None:
+            print(f"STATS {name} {json.dumps(dataclasses.asdict(stats), sort_keys=True)}")
+    return 1 if failed else 0
+
+
 def main(argv: list[str] | None = None) -> int:
     p = argparse.ArgumentParser(prog="flavent")
     sub = p.add_subparsers(dest="cmd", required=True)
@@ -112,6 +164,57 @@ def main(argv: list[str] | None = None) -> int:
     )
     p_check.add_argument("--max-warnings", type=int, default=-1, help="Fail when active warning count exceeds this limit")
 
+    p_test = sub.add_parser("test", help="Run flvtest cases in a file")
+    p_test.add_argument("file")
+    p_test.add_argument("--case", default="", help="Run only this test case")
+    p_test.add_argument(
+        "--queue-limit",
+        action="append",
+        default=[],
+        metavar="Event.X=CAPACITY[:POLICY]",
+        help="Bound an event type's dispatch queue (policy: block, drop_oldest, drop_newest, fail; repeatable)",
+    )
+    p_test.add_argument(
+        "--event-priority",
+        action="append",
+        default=[],
+        metavar="Event.X=N",
+        help="Serve an event type from priority lane N by weighted round-robin (repeatable)",
+    )
+    p_test.add_argument(
+        "--sector-weight",
+        action="append",
+        default=[],
+        metavar="SECTOR=N",
+        help="Give a sector N scheduler slices per round (repeatable)",
+    )
+    p_test.add_argument(
+        "--batch",
+        action="append",
+        default=[],
+        metavar="Event.X=N",
+        help="Dispatch up to N queued events of a type per handler task (repeatable)",
+    )
+    p_test.add_argument("--stats", action="store_true", help="Print runtime queue/step counters per case")
+    p_test.add_argument(
+        "--max-steps",
+        type=_non_negative_int,
+        default=DEFAULT_MAX_STEPS,
+        help=f"Fail a case after this many executed statements (0 = no limit; default {DEFAULT_MAX_STEPS})",
+    )
+    p_test.add_argument(
+        "--preempt-budget",
+        type=_non_negative_int,
+        default=DEFAULT_PREEMPT_BUDGET,
+        help=f"Preempt a task after this many statements in one slice (0 = off; default {DEFAULT_PREEMPT_BUDGET})",
+    )
+    p_test.add_argument(
+        "--handler-step-budget",
+        type=_non_negative_int,
+        default=0,
+        help="Fail when one handler task runs more statements than this (0 = no limit)",
+    )
+
     args = p.parse_args(argv)
 
     if args.cmd == "pkg":
@@ -160,6 +263,9 @@ def main(argv: list[str] | None = None) -> int:
             print(f"PkgError: {e}")
             return 2
 
+    if args.cmd == "test":
+        return _run_tests(args)
+
     path = Path(args.file)
     src = path.read_text(encoding="utf-8")
     check_issues: list[ReportIssue] = []
@@ -0,0 +1,433 @@
+from __future__ import annotations
+
+import heapq
+import itertools
+from typing import Any, Iterable
+
+# Host-side persistent collections for `stdlib/collections`.
+#
+# Collections are values: every update returns a new collection and older
+# ones keep their contents. All versions of one collection share a single
+# Python list (Baker's "rerooting" persistent arrays): the newest version
+# owns the list and every older version stores the few cells it differs in
+# from the version after it. Updating the version that owns the list (the
+# usual linear use) costs only the cells written; touching an older version
+# first rolls the list back to it, proportional to how far it is behind.
+
+
+class _Node:
+    __slots__ = ("data", "length", "old", "next")
+
+    def __init__(self, data: list[Any] | None) -> None:
+        # Owning version: `data` is the shared list. Older version: `data` is
+        # None and the version is `next` truncated/extended to `length` with
+        # the cells in `old` overwritten.
+        self.data = data
+        self.length = 0
+        self.old: dict[int, Any] | None = None
+        self.next: _Node | None = None
+
+
+def _reroot(node: _Node) -> list[Any]:
+    if node.data is not None:
+        return node.data
+    path = []
+    n = node
+    while n.data is None:
+        path.append(n)
+        assert n.next is not None
+        n = n.next
+    data = n.data
+    for p in reversed(path):
+        cur = p.next
+        assert cur is not None and p.old is not None
+        cur_len = len(data)
+        inv = {i: data[i] for i in p.old if i < cur_len}
+        for i in range(p.length, cur_len):
+            inv[i] = data[i]
+        if cur_len > p.length:
+            del data[p.length :]
+        elif cur_len < p.length:
+            data.extend([None] * (p.length - cur_len))
+        for i, v in p.old.items():
+            data[i] = v
+        cur.data, cur.length, cur.old, cur.next = None, cur_len, inv, p
+        p.data, p.old, p.next = data, None, None
+    return data
+
+
+class _Edit:
+    """Records the cells a new version overwrites in the shared list."""
+
+    __slots__ = ("node", "data", "length", "old")
+
+    def __init__(self, node: _Node) -> None:
+        self.node = node
+        self.data = _reroot(node)
+        self.length = len(self.data)
+        self.old: dict[int, Any] = {}
+
+    def _save(self, i: int) -> None:
+        if i < self.length and i not in self.old:
+            self.old[i] = self.data[i]
+
+    def set(self, i: int, v: Any) -> None:
+        self._save(i)
+        self.data[i] = v
+
+    def append(self, v: Any) -> None:
+        self.data.append(v)
+
+    def pop(self) -> Any:
+        self._save(len(self.data) - 1)
+        return self.data.pop()
+
+    def replace_all(self, xs: list[Any]) -> None:
+        for i in range(len(self.data)):
+            self._save(i)
+        self.data[:] = xs
+
+    def commit(self) -> _Node:
+        new = _Node(self.data)
+        old = self.node
+        old.data, old.length, old.old, old.next = None, self.length, self.old, new
+        return new
+
+
+# --- Priority queue heap -----------------------------------------------------
+#
+# Entries are `(priority, seq, value)`; `seq` grows with every push, so equal
+# priorities pop in insertion order and values are never compared.
+
+_SEQ = itertools.count()
+
+
+def _sift_up(e: _Edit, i: int) -> None:
+    data = e.data
+    item = data[i]
+    while i > 0:
+        parent = (i - 1) >> 1
+        if not item < data[parent]:
+            break
+        e.set(i, data[parent])
+        i = parent
+    e.set(i, item)
+
+
+def _sift_down(e: _Edit, i: int) -> None:
+    data = e.data
+    n = len(data)
+    item = data[i]
+    while True:
+        child = 2 * i + 1
+        if child >= n:
+            break
+        if child + 1 < n and data[child + 1] < data[child]:
+            child += 1
+        if not data[child] < item:
+            break
+        e.set(i, data[child])
+        i = child
+    e.set(i, item)
+
+
+class PersistentHeap:
+    __slots__ = ("_node",)
+
+    def __init__(self, node: _Node) -> None:
+        self._node = node
+
+    def _data(self) -> list[Any]:
+        return _reroot(self._node)
+
+    def __len__(self) -> int:
+        return len(self._data())
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, PersistentHeap):
+            return NotImplemented
+        return self.items() == other.items()
+
+    def __hash__(self) -> int:
+        return hash(tuple((p, repr(v)) for p, v in self.items()))
+
+    def __repr__(self) -> str:
+        return f"PersistentHeap({self.items()!r})"
+
+    def push(self, priority: int, value: Any) -> PersistentHeap:
+        e = _Edit(self._node)
+        e.append((priority, next(_SEQ), value))
+        _sift_up(e, len(e.data) - 1)
+        return PersistentHeap(e.commit())
+
+    def push_all(self, items: Iterable[tuple[int, Any]]) -> PersistentHeap:
+        add = [(p, next(_SEQ), v) for p, v in items]
+        if not add:
+            return self
+        e = _Edit(self._node)
+        if len(add) >= len(e.data):
+            # Rebuilding is O(n) and beats len(add) sifts.
+            merged = e.data + add
+            heapq.heapify(merged)
+            e.replace_all(merged)
+        else:
+            for entry in add:
+                e.append(entry)
+                _sift_up(e, len(e.data) - 1)
+        return PersistentHeap(e.commit())
+
+    def pop(self) -> PersistentHeap:
+        if not self._data():
+            return self
+        e = _Edit(self._node)
+        last = e.pop()
+        if e.data:
+            e.set(0, last)
+            _sift_down(e, 0)
+        return PersistentHeap(e.commit())
+
+    def peek(self) -> tuple[int, Any] | None:
+        data = self._data()
+        if not data:
+            return None
+        p, _seq, v = data[0]
+        return p, v
+
+    def items(self) -> list[tuple[int, Any]]:
+        """All `(priority, value)` pairs in pop order."""
+        return [(p, v) for p, _seq, v in sorted(self._data())]
+
+
+def new_heap() -> PersistentHeap:
+    return PersistentHeap(_Node([]))
+
+
+# --- Deque ring buffer -------------------------------------------------------
+#
+# A version is a window `(head, size)` over the shared ring buffer. Pops only
+# move the window, so they share the buffer without recording anything; pushes
+# write one cell and the buffer doubles when full.
+
+_MIN_CAPACITY = 8
+
+
+class PersistentDeque:
+    __slots__ = ("_node", "_head", "_size")
+
+    def __init__(self, node: _Node, head: int, size: int) -> None:
+        self._node = node
+        self._head = head
+        self._size = size
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, PersistentDeque):
+            return NotImplemented
+        return self.items() == other.items()
+
+    def __hash__(self) -> int:
+        return hash(tuple(repr(v) for v in self.items()))
+
+    def __repr__(self) -> str:
+        return f"PersistentDeque({self.items()!r})"
+
+    def _edit(self, extra: int) -> tuple[_Edit, int]:
+        """Opens an edit with room for `extra` more items; returns it and the head."""
+        e = _Edit(self._node)
+        cap = len(e.data)
+        if self._size + extra <= cap:
+            return e, self._head
+        new_cap = max(_MIN_CAPACITY, cap)
+        while new_cap < self._size + extra:
+            new_cap *= 2
+        e.replace_all(self._window(e.data) + [None] * (new_cap - self._size))
+        return e, 0
+
+    def _window(self, data: list[Any]) -> list[Any]:
+        cap = len(data)
+        end = self._head + self._size
+        if end <= cap:
+            return data[self._head : end]
+        return data[self._head :] + data[: end - cap]
+
+    def push_back_all(self, xs: Iterable[Any]) -> PersistentDeque:
+        xs = list(xs)
+        if not xs:
+            return self
+        e, head = self._edit(len(xs))
+        cap = len(e.data)
+        for k, x in enumerate(xs):
+            e.set((head + self._size + k) % cap, x)
+        return PersistentDeque(e.commit(), head, self._size + len(xs))
+
+    def push_front_all(self, xs: Iterable[Any]) -> PersistentDeque:
+        """Pushes each item to the front in turn, so the last one ends up first."""
+        xs = list(xs)
+        if not xs:
+            return self
+        e, head = self._edit(len(xs))
+        cap = len(e.data)
+        for x in xs:
+            head = (head - 1) % cap
+            e.set(head, x)
+        return PersistentDeque(e.commit(), head, self._size + len(xs))
+
+    def push_back(self, x: Any) -> PersistentDeque:
+        return self.push_back_all((x,))
+
+    def push_front(self, x: Any) -> PersistentDeque:
+        return self.push_front_all((x,))
+
+    def pop_front(self) -> PersistentDeque:
+        if not self._size:
+            return self
+        cap = len(_reroot(self._node))
+        return PersistentDeque(self._node, (self._head + 1) % cap, self._size - 1)
+
+    def pop_back(self) -> PersistentDeque:
+        if not self._size:
+            return self
+        return PersistentDeque(self._node, self._head, self._size - 1)
+
+    def peek_front(self) -> Any | None:
+        """First item, or None when empty (check `len` for None items)."""
+        if not self._size:
+            return None
+        return _reroot(self._node)[self._head]
+
+    def peek_back(self) -> Any | None:
+        if not self._size:
+            return None
+        data = _reroot(self._node)
+        return data[(self._head + self._size - 1) % len(data)]
+
+    def items(self) -> list[Any]:
+        """All items from front to back."""
+        return self._window(_reroot(self._node))
+
+
+def new_deque(xs: Iterable[Any] = ()) -> PersistentDeque:
+    return PersistentDeque(_Node([]), 0, 0).push_back_all(xs)
+
+
+# --- Vector ------------------------------------------------------------------
+#
+# A version is the whole shared list, so indexed reads are O(1) and `set`,
+# `push` and `pop` record one cell.
+
+
+class PersistentVector:
+    __slots__ = ("_node",)
+
+    def __init__(self, node: _Node) -> None:
+        self._node = node
+
+    def __len__(self) -> int:
+        return len(_reroot(self._node))
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, PersistentVector):
+            return NotImplemented
+        return self.items() == other.items()
+
+    def __hash__(self) -> int:
+        return hash(tuple(repr(v) for v in self.items()))
+
+    def __repr__(self) -> str:
+        return f"PersistentVector({self.items()!r})"
+
+    def get(self, i: int) -> tuple[bool, Any]:
+        """`(True, item)` for an index in range, else `(False, None)`."""
+        data = _reroot(self._node)
+        if 0 <= i < len(data):
+            return True, data[i]
+        return False, None
+
+    def set(self, i: int, x: Any) -> PersistentVector:
+        if not 0 <= i < len(self):
+            return self
+        e = _Edit(self._node)
+        e.set(i, x)
+        return PersistentVector(e.commit())
+
+    def swap(self, i: int, j: int) -> PersistentVector:
+        n = len(self)
+        if i == j or not (0 <= i < n and 0 <= j < n):
+            return self
+        e = _Edit(self._node)
+        xi, xj = e.data[i], e.data[j]
+        e.set(i, xj)
+        e.set(j, xi)
+        return PersistentVector(e.commit())
+
+    def push_all(self, xs: Iterable[Any]) -> PersistentVector:
+        e = _Edit(self._node)
+        for x in xs:
+            e.append(x)
+        if len(e.data) == e.length:
+            return self
+        return PersistentVector(e.commit())
+
+    def push(self, x: Any) -> PersistentVector:
+        return self.push_all((x,))
+
+    def pop(self) -> PersistentVector:
+        if not len(self):
+            return self
+        e = _Edit(self._node)
+        e.pop()
+        return PersistentVector(e.commit())
+
+    def slice(self, start: int, end: int) -> PersistentVector:
+        """Items `start..end` (clamped to the vector) as a new vector."""
+        data = _reroot(self._node)
+        start = max(0, start)
+        end = min(len(data), end)
+        return PersistentVector(_Node(data[start:end] if start < end else []))
+
+    def sorted(self) -> PersistentVector:
+        return PersistentVector(_Node(sorted(_reroot(self._node))))
+
+    def items(self) -> list[Any]:
+        return list(_reroot(self._node))
+
+
+def new_vector(xs: Iterable[Any] = ()) -> PersistentVector:
+    return PersistentVector(_Node(list(xs)))
+
+
+# Record layouts of the stdlib wrappers around the host collections, keyed by
+# field names: `Vector` is `{ buf, last }`, `Deque` and `Queue` are
+# `{ buf, first }`.
+_WRAPPERS: dict[frozenset[str], type] = {
+    frozenset(("buf", "last")): PersistentVector,
+    frozenset(("buf", "first")): PersistentDeque,
+}
+
+
+def wrapper_items(v: Any) -> list[Any] | None:
+    """Items of a `Vector`, `Deque` or `Queue` value (front to back), or None.
+
+    A record only counts when it has exactly the wrapper's fields and its
+    `buf` holds the matching host collection, so other records that happen to
+    have a `buf` field are never iterated this way.
+    """
+    if type(v) is not dict or len(v) != 2:
+        return None
+    cls = _WRAPPERS.get(frozenset(v))
+    if cls is None or not isinstance(v["buf"], cls):
+        return None
+    return v["buf"].items()
+
+
+__all__ = [
+    "PersistentDeque",
+    "PersistentHeap",
+    "PersistentVector",
+    "new_deque",
+    "new_heap",
+    "new_vector",
+    "wrapper_items",
+]
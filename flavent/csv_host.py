@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import re
+from functools import lru_cache
+
+# Host-side record scanner for `stdlib/csv/stream.flv`.
+#
+# Field rules are the ones of `csv.csvParseLineWith`: a quote character opens
+# a quoted section anywhere in a field, a doubled quote inside it is a literal
+# quote, and text around quoted sections is kept. On top of that a record ends
+# at a newline outside quotes (a `\r` right before it is dropped), so quoted
+# fields may span lines.
+
+UNTERMINATED = "csv: unterminated quoted field"
+
+
+@lru_cache(maxsize=64)
+def _special(delim: str, quote: str) -> re.Pattern[str]:
+    return re.compile("[" + re.escape(delim + quote) + "\n]")
+
+
+@lru_cache(maxsize=64)
+def _boundary(quote: str) -> re.Pattern[str]:
+    return re.compile("[" + re.escape(quote) + "\n]")
+
+
+def _record_end(buf: str, pos: int, quote: str, quoted: bool) -> tuple[int, int, bool]:
+    # Index of the newline that ends the record scanned from `pos` as
+    # `(end, -1, False)`, or `(-1, resume, quoted)` when the buffer ends first;
+    # passing `resume` and `quoted` back in continues the scan there. Doubled
+    # quotes need no special case: they close and reopen the quoted section.
+    boundary = _boundary(quote)
+    n = len(buf)
+    i = pos
+    while True:
+        if quoted:
+            q = buf.find(quote, i)
+            if q < 0:
+                return -1, n, True
+            quoted = False
+            i = q + 1
+            continue
+        m = boundary.search(buf, i)
+        if m is None:
+            return -1, n, False
+        if buf[m.start()] == "\n":
+            return m.start(), -1, False
+        quoted = True
+        i = m.end()
+
+
+def _record(buf: str, pos: int, delim: str, quote: str) -> tuple[list[str], int]:
+    # One record starting at `pos` that is known to be complete: `(fields, next)`.
+    special = _special(delim, quote)
+    n = len(buf)
+    fields: list[str] = []
+    field: list[str] = []
+    i = pos
+    while True:
+        m = special.search(buf, i)
+        if m is None:
+            field.append(buf[i:n])
+            fields.append("".join(field))
+            return fields, n
+        j = m.start()
+        c = buf[j]
+        if c == quote:
+            field.append(buf[i:j])
+            i = j + 1
+            while True:
+                q = buf.find(quote, i)
+                if q < 0:
+                    raise ValueError(UNTERMINATED)
+                if q + 1 < n and buf[q + 1] == quote:
+                    field.append(buf[i:q] + quote)
+                    i = q + 2
+                    continue
+                field.append(buf[i:q])
+                i = q + 1
+                break
+        elif c == delim:
+            field.append(buf[i:j])
+            fields.append("".join(field))
+            field = []
+            i = j + 1
+        else:
+            end = j - 1 if j > i and buf[j - 1] == "\r" else j
+            field.append(buf[i:end])
+            fields.append("".join(field))
+            return fields, j + 1
+
+
+def scan_records(
+    buf: str, delim: str, quote: str, scan: int, quoted: bool, final: bool
+) -> tuple[list[list[str]], str, int, bool]:
+    """Parse the complete records in `buf`; returns `(records, rest, scan, quoted)`.
+
+    `scan` and `quoted` say how far into the unfinished record at the start of
+    `buf` an earlier call got and whether it stopped inside quotes; the
+    returned pair describes `rest` the same way, so each chunk is scanned once.
+    A trailing newline does not start an empty record. Raises `ValueError`
+    for a quoted field that is still open at the end of final input.
+    """
+    out: list[list[str]] = []
+    pos = 0
+    n = len(buf)
+    while pos < n:
+        end, scan, quoted = _record_end(buf, max(pos, scan), quote, quoted)
+        if end < 0 and not final:
+            return out, buf[pos:], scan - pos, quoted
+        fields, pos = _record(buf, pos, delim, quote)
+        out.append(fields)
+    return out, "", 0, False
+
+
+def encode_row(fields: list[str], delim: str, quote: str) -> str:
+    """One record as `csv.csvStringifyLineWith` writes it (no newline)."""
+    doubled = quote + quote
+    out = []
+    for f in fields:
+        if delim in f or quote in f or "\n" in f or "\r" in f:
+            f = quote + f.replace(quote, doubled) + quote
+        out.append(f)
+    return delim.join(out)
+
+
+__all__ = [
+    "UNTERMINATED",
+    "encode_row",
+    "scan_records",
+]
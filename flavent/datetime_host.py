@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import re
+from typing import Any
+
+# Host-side ISO-8601 parsing/formatting and epoch conversions for
+# `stdlib/datetime`.
+#
+# Parsing accepts exactly the layouts of the original Flavent parser
+# (`YYYY-MM-DD`, `HH:MM:SS[.mmm]`, joined by `T`) with ASCII digits only, and
+# raises ValueError with its messages. Formatting reproduces its padding
+# (`_pad2`/`_pad3`/`_pad4`, millis only when non-zero).
+#
+# Epoch conversions use the proleptic Gregorian calendar in UTC and work for
+# any year (Howard Hinnant's `days_from_civil` / `civil_from_days`). Out of
+# range fields roll over: month 13 is January of the next year, day 0 is the
+# last day of the previous month, hour 24 is midnight of the next day.
+
+_DATE = re.compile(r"([0-9]{4})-([0-9]{2})-([0-9]{2})")
+_TIME = re.compile(r"([0-9]{2}):([0-9]{2}):([0-9]{2})(?:\.([0-9]{3}))?")
+
+_ERR_DATE = "datetime: expected YYYY-MM-DD"
+_ERR_TIME = "datetime: expected HH:MM:SS or HH:MM:SS.mmm"
+_ERR_DATETIME = "datetime: expected YYYY-MM-DDTHH:MM:SS(.mmm)"
+_ERR_DIGIT = "datetime: invalid digit"
+
+_MS_PER_DAY = 86_400_000
+
+_DAYS_IN_MONTH = (31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+
+
+def is_leap_year(year: int) -> bool:
+    return year % 4 == 0 and (year % 100 != 0 or year % 400 == 0)
+
+
+def _date_is_valid(y: int, m: int, d: int) -> bool:
+    if not 1 <= m <= 12:
+        return False
+    dim = 29 if m == 2 and is_leap_year(y) else _DAYS_IN_MONTH[m - 1]
+    return 1 <= d <= dim
+
+
+def parse_date(s: str) -> dict[str, int]:
+    m = _DATE.fullmatch(s)
+    if m is None:
+        if len(s) != 10 or s[4] != "-" or s[7] != "-":
+            raise ValueError(_ERR_DATE)
+        raise ValueError(_ERR_DIGIT)
+    y, mo, d = int(m[1]), int(m[2]), int(m[3])
+    if not _date_is_valid(y, mo, d):
+        raise ValueError("datetime: invalid date")
+    return {"year": y, "month": mo, "day": d}
+
+
+def parse_time(s: str) -> dict[str, int]:
+    m = _TIME.fullmatch(s)
+    if m is None:
+        n = len(s)
+        if n not in (8, 12) or s[2] != ":" or s[5] != ":" or (n == 12 and s[8] != "."):
+            raise ValueError(_ERR_TIME)
+        raise ValueError(_ERR_DIGIT)
+    h, mi, sec = int(m[1]), int(m[2]), int(m[3])
+    ms = int(m[4]) if m[4] is not None else 0
+    if not (h <= 23 and mi <= 59 and sec <= 59):
+        raise ValueError("datetime: invalid time")
+    return {"hour": h, "minute": mi, "second": sec, "millis": ms}
+
+
+def parse_datetime(s: str) -> dict[str, Any]:
+    if len(s) not in (19, 23) or s[10] != "T":
+        raise ValueError(_ERR_DATETIME)
+    return {"date": parse_date(s[:10]), "time": parse_time(s[11:])}
+
+
+def _pad(n: int, width: int) -> str:
+    # Mirrors the Flavent `_padN` helpers, including their handling of
+    # negative numbers ("0" + "-5").
+    for k in range(1, width):
+        if n < 10**k:
+            return "0" * (width - k) + str(n)
+    return str(n)
+
+
+def format_date(y: int, m: int, d: int) -> str:
+    return f"{_pad(y, 4)}-{_pad(m, 2)}-{_pad(d, 2)}"
+
+
+def format_time(h: int, mi: int, s: int, ms: int) -> str:
+    base = f"{_pad(h, 2)}:{_pad(mi, 2)}:{_pad(s, 2)}"
+    return f"{base}.{_pad(ms, 3)}" if ms > 0 else base
+
+
+def days_from_civil(y: int, m: int, d: int) -> int:
+    """Days since 1970-01-01 (negative before)."""
+    y += (m - 1) // 12
+    m = (m - 1) % 12 + 1
+    y -= m <= 2
+    era = y // 400
+    yoe = y - era * 400
+    doy = (153 * (m - 3 if m > 2 else m + 9) + 2) // 5
+    doe = yoe * 365 + yoe // 4 - yoe // 100 + doy
+    return era * 146097 + doe - 719468 + (d - 1)
+
+
+def civil_from_days(z: int) -> dict[str, int]:
+    z += 719468
+    era = z // 146097
+    doe = z - era * 146097
+    yoe = (doe - doe // 1460 + doe // 36524 - doe // 146096) // 365
+    doy = doe - (365 * yoe + yoe // 4 - yoe // 100)
+    mp = (5 * doy + 2) // 153
+    d = doy - (153 * mp + 2) // 5 + 1
+    m = mp + 3 if mp < 10 else mp - 9
+    return {"year": yoe + era * 400 + (m <= 2), "month": m, "day": d}
+
+
+def to_epoch_millis(y: int, mo: int, d: int, h: int, mi: int, s: int, ms: int) -> int:
+    return days_from_civil(y, mo, d) * _MS_PER_DAY + ((h * 60 + mi) * 60 + s) * 1000 + ms
+
+
+def from_epoch_millis(t: int) -> dict[str, Any]:
+    days, ms = divmod(t, _MS_PER_DAY)
+    secs, millis = divmod(ms, 1000)
+    mins, sec = divmod(secs, 60)
+    hour, minute = divmod(mins, 60)
+    return {
+        "date": civil_from_days(days),
+        "time": {"hour": hour, "minute": minute, "second": sec, "millis": millis},
+    }
+
+
+__all__ = [
+    "civil_from_days",
+    "days_from_civil",
+    "format_date",
+    "format_time",
+    "from_epoch_millis",
+    "is_leap_year",
+    "parse_date",
+    "parse_datetime",
+    "parse_time",
+    "to_epoch_millis",
+]
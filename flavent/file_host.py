@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+import mmap
+import os
+from typing import Any, BinaryIO
+
+# Host-side file handles for the `fs*` handle calls of `sector _bridge_python`
+# (`fslib.openFile`, `fslib.readChunk`, ...).
+#
+# A `Bridge` that serves the filesystem can route these calls here:
+#
+#     if FileHandles.handles(name):
+#         return self.files.call(name, args)
+#
+# Handles are small ints. Regular handles wrap buffered binary files; mmap
+# handles map a read-only file and read from the mapping, so the OS pages the
+# file in on demand. Text is UTF-8 like `fsReadFileStr`; lines are split on
+# `\n` only and keep any `\r`, like `file.lines.splitLines`.
+
+_MODES = {"r": "rb", "w": "wb", "a": "ab"}
+
+_NIL: Any = ("Nil", [])
+
+
+def _ok(v: Any) -> Any:
+    return ("Ok", [v])
+
+
+def _err(msg: str) -> Any:
+    return ("Err", [msg])
+
+
+def _cons(xs: list[Any]) -> Any:
+    out = _NIL
+    for x in reversed(xs):
+        out = ("Cons", [x, out])
+    return out
+
+
+class _Mapped:
+    """Read-only mmap with the file-like calls used below."""
+
+    __slots__ = ("_file", "_map")
+
+    def __init__(self, path: str) -> None:
+        self._file = open(path, "rb")
+        try:
+            size = os.fstat(self._file.fileno()).st_size
+            # Empty files cannot be mapped; serve them from the (empty) file.
+            self._map: Any = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else None
+        except BaseException:
+            self._file.close()
+            raise
+
+    def read(self, n: int) -> bytes:
+        return self._map.read(n) if self._map is not None else b""
+
+    def readline(self) -> bytes:
+        return self._map.readline() if self._map is not None else b""
+
+    def write(self, data: bytes) -> int:
+        raise OSError("file opened read-only (mmap)")
+
+    def close(self) -> None:
+        if self._map is not None:
+            self._map.close()
+        self._file.close()
+
+
+class FileHandles:
+    """Open file handles of one program run."""
+
+    NAMES = frozenset(
+        {"fsOpen", "fsOpenMmap", "fsReadChunk", "fsReadLine", "fsReadLines", "fsWrite", "fsClose"}
+    )
+
+    def __init__(self) -> None:
+        self._files: dict[int, BinaryIO | _Mapped] = {}
+        self._next = 1
+
+    @classmethod
+    def handles(cls, name: str) -> bool:
+        return name in cls.NAMES
+
+    def _add(self, f: BinaryIO | _Mapped) -> int:
+        h = self._next
+        self._next += 1
+        self._files[h] = f
+        return h
+
+    def _get(self, h: int) -> BinaryIO | _Mapped:
+        f = self._files.get(h)
+        if f is None:
+            raise ValueError(f"invalid file handle: {h}")
+        return f
+
+    def open(self, path: str, mode: str) -> int:
+        m = _MODES.get(mode)
+        if m is None:
+            raise ValueError(f"invalid file mode: {mode}")
+        return self._add(open(path, m))
+
+    def open_mmap(self, path: str) -> int:
+        return self._add(_Mapped(path))
+
+    def read_chunk(self, h: int, n: int) -> bytes:
+        return self._get(h).read(max(0, n))
+
+    def read_line(self, h: int) -> str:
+        """Next line including its `\\n`; `""` at end of file."""
+        return self._get(h).readline().decode("utf-8")
+
+    def read_lines(self, h: int, limit: int) -> list[str]:
+        """Up to `limit` lines without their `\\n`; `[]` at end of file or for `limit <= 0`."""
+        f = self._get(h)
+        out: list[str] = []
+        for _ in range(limit):
+            raw = f.readline()
+            if not raw:
+                break
+            out.append(raw[:-1].decode("utf-8") if raw.endswith(b"\n") else raw.decode("utf-8"))
+        return out
+
+    def write(self, h: int, data: bytes) -> None:
+        self._get(h).write(data)
+
+    def close(self, h: int) -> None:
+        self._get(h).close()
+        del self._files[h]
+
+    def close_all(self) -> None:
+        for f in self._files.values():
+            f.close()
+        self._files.clear()
+
+    def call(self, name: str, args: list[Any]) -> Any:
+        """Serve one bridge call; returns the runtime `Result` value."""
+        try:
+            if name == "fsOpen":
+                return _ok(self.open(str(args[0]), str(args[1])))
+            if name == "fsOpenMmap":
+                return _ok(self.open_mmap(str(args[0])))
+            if name == "fsReadChunk":
+                return _ok(self.read_chunk(int(args[0]), int(args[1])))
+            if name == "fsReadLine":
+                return _ok(self.read_line(int(args[0])))
+            if name == "fsReadLines":
+                return _ok(_cons(self.read_lines(int(args[0]), int(args[1]))))
+            if name == "fsWrite":
+                self.write(int(args[0]), bytes(args[1]))
+                return _ok(())
+            if name == "fsClose":
+                self.close(int(args[0]))
+                return _ok(())
+        except (OSError, ValueError) as e:
+            return _err(str(e))
+        raise RuntimeError(f"not a file handle call: {name}")
+
+
+__all__ = [
+    "FileHandles",
+]
@@ -0,0 +1,314 @@
+from __future__ import annotations
+
+import json
+import re
+from typing import Any
+
+# Host-side `json.loads` / `json.dumps` for the `stdlib/json` module.
+#
+# Values use the runtime representation of `JsonValue`: sum values are
+# `(CtorName, payload)` tuples, `List` is Cons/Nil and `Map` is a list of
+# `{ key, value }` records (dicts). Output of `dumps` is byte-for-byte the
+# same as the pure Flavent serializer.
+
+PARSE_ERROR = "json parse error"
+
+_NIL: Any = ("Nil", [])
+
+# Only the escapes the pure serializer emits; everything else is written raw.
+_ESCAPES = str.maketrans({'"': '\\"', "\\": "\\\\", "\n": "\\n", "\r": "\\r", "\t": "\\t"})
+
+
+def _reject_constant(name: str) -> Any:
+    raise ValueError(f"invalid JSON constant: {name}")
+
+
+_DECODER = json.JSONDecoder(strict=False, parse_constant=_reject_constant)
+
+
+def _cons(xs: list[Any]) -> Any:
+    out = _NIL
+    for x in reversed(xs):
+        out = ("Cons", [x, out])
+    return out
+
+
+def _from_py(x: Any) -> Any:
+    if x is None:
+        return ("JNull", [])
+    if isinstance(x, bool):
+        return ("JBool", [x])
+    if isinstance(x, int):
+        return ("JInt", [x])
+    if isinstance(x, float):
+        return ("JFloat", [x])
+    if isinstance(x, str):
+        return ("JStr", [x])
+    if isinstance(x, list):
+        return ("JArr", [_cons([_from_py(v) for v in x])])
+    # dict: duplicate keys keep the first position and the last value, like `mapPut`.
+    return ("JObj", [_cons([{"key": k, "value": _from_py(v)} for k, v in x.items()])])
+
+
+def loads(s: str) -> tuple[bool, Any]:
+    """Parse `s` into a `JsonValue`; returns `(ok, value_or_error)`."""
+    try:
+        obj = _DECODER.decode(s)
+    except (ValueError, RecursionError):
+        return False, PARSE_ERROR
+    return True, _from_py(obj)
+
+
+def _iter_list(v: Any) -> Any:
+    while v[0] == "Cons":
+        yield v[1][0]
+        v = v[1][1]
+
+
+def _dump(v: Any, out: list[str]) -> None:
+    tag, payload = v
+    if tag == "JNull":
+        out.append("null")
+    elif tag == "JBool":
+        out.append("true" if payload[0] else "false")
+    elif tag == "JInt":
+        out.append(str(int(payload[0])))
+    elif tag == "JFloat":
+        out.append(str(float(payload[0])))
+    elif tag == "JStr":
+        out.append('"' + str(payload[0]).translate(_ESCAPES) + '"')
+    elif tag == "JArr":
+        out.append("[")
+        first = True
+        for x in _iter_list(payload[0]):
+            if not first:
+                out.append(",")
+            first = False
+            _dump(x, out)
+        out.append("]")
+    elif tag == "JObj":
+        out.append("{")
+        first = True
+        for e in _iter_list(payload[0]):
+            if not first:
+                out.append(",")
+            first = False
+            out.append('"' + str(e["key"]).translate(_ESCAPES) + '":')
+            _dump(e["value"], out)
+        out.append("}")
+    else:
+        raise RuntimeError(f"not a JsonValue: {tag}")
+
+
+def dumps(v: Any) -> str:
+    out: list[str] = []
+    _dump(v, out)
+    return "".join(out)
+
+
+# --- Streaming -------------------------------------------------------------
+#
+# The stream readers in `stdlib/json/stream.flv` keep their own buffers; these
+# helpers only scan a buffer and report how far they got, so every reader
+# state stays an immutable Flavent value.
+
+_WS = re.compile(r"[ \t\n\r]*")
+_STRING = re.compile(r'"[^"\\]*(?:\\.[^"\\]*)*"')
+_NUMBER = re.compile(r"-?(?:0|[1-9][0-9]*)(?:\.[0-9]+)?(?:[eE][+-]?[0-9]+)?")
+_NUMBER_TAIL = re.compile(r"[0-9.eE+-]*")
+_STRUCTURE = re.compile(r'"[^"\\]*(?:\\.[^"\\]*)*"|["\[\]{},]')
+_STRING_BODY = re.compile(r'[^"\\]*(?:\\.[^"\\]*)*')
+_LITERALS = {"true": True, "false": False, "null": None}
+_PUNCT = {"{": 1, "}": 2, "[": 3, "]": 4, ":": 5, ",": 6}
+
+# Token kinds returned by `lex_token`.
+LEX_NEED_INPUT = 0
+LEX_STRING = 7
+LEX_SCALAR = 8
+LEX_END = -1
+LEX_ERROR = -2
+
+_NULL: Any = ("JNull", [])
+
+
+def lex_token(buf: str, pos: int, final: bool) -> tuple[int, int, str, Any]:
+    """Lex one JSON token at `pos`: `(kind, next, text, value)`.
+
+    Punctuation kinds are 1-6 (`{ } [ ] : ,`); strings carry the decoded text and
+    a `JStr`, scalars a `JsonValue`. A token that may continue past the end of a
+    non-final buffer reports `LEX_NEED_INPUT` without consuming anything.
+    """
+    n = len(buf)
+    i = _WS.match(buf, pos).end()
+    if i >= n:
+        return (LEX_END if final else LEX_NEED_INPUT), i, "", _NULL
+    c = buf[i]
+    kind = _PUNCT.get(c)
+    if kind is not None:
+        return kind, i + 1, c, _NULL
+    if c == '"':
+        m = _STRING.match(buf, i)
+        if m is None:
+            return (LEX_ERROR if final else LEX_NEED_INPUT), i, PARSE_ERROR, _NULL
+        try:
+            text = _DECODER.decode(m.group(0))
+        except ValueError:
+            return LEX_ERROR, i, PARSE_ERROR, _NULL
+        return LEX_STRING, m.end(), text, ("JStr", [text])
+    m = _NUMBER.match(buf, i)
+    if m is not None:
+        if not final and _NUMBER_TAIL.fullmatch(buf, m.end()):
+            # The number may continue in the next chunk (`1` + `2`, `1.` + `5`).
+            return LEX_NEED_INPUT, i, "", _NULL
+        return LEX_SCALAR, m.end(), m.group(0), _from_py(_DECODER.decode(m.group(0)))
+    for word, value in _LITERALS.items():
+        if buf.startswith(word, i):
+            return LEX_SCALAR, i + len(word), word, _from_py(value)
+        if not final and n - i < len(word) and word.startswith(buf[i:]):
+            return LEX_NEED_INPUT, i, "", _NULL
+    if c == "-" and i + 1 >= n and not final:
+        return LEX_NEED_INPUT, i, "", _NULL
+    return LEX_ERROR, i, PARSE_ERROR, _NULL
+
+
+def _element_end(buf: str, start: int, depth: int) -> tuple[int, int, int]:
+    # End of the array element being scanned from `start` (the index of the
+    # `,` / `]` that follows it) as `(end, -1, 0)`, or `(-1, resume, depth)` if
+    # the buffer does not hold all of it yet; passing `resume` and `depth` back
+    # in continues the scan there instead of rescanning the element. A negative
+    # depth `~d` means the scan stopped inside a string at container depth `d`.
+    n = len(buf)
+    if depth < 0:
+        depth = ~depth
+        start = _STRING_BODY.match(buf, start).end()
+        if start >= n or buf[start] != '"':
+            return -1, start, ~depth
+        start += 1
+    for m in _STRUCTURE.finditer(buf, start):
+        tok = m.group(0)
+        if tok == '"':
+            body = _STRING_BODY.match(buf, m.end()).end()
+            return -1, body, ~depth
+        c = tok[0]
+        if c == '"':
+            continue
+        if c in "[{":
+            depth += 1
+        elif c in "]}":
+            if depth == 0:
+                return m.start(), -1, 0
+            depth -= 1
+        elif depth == 0:
+            return m.start(), -1, 0
+    return -1, n, depth
+
+
+def _decode(text: str) -> Any:
+    try:
+        return _from_py(_DECODER.decode(text))
+    except (ValueError, RecursionError):
+        raise ValueError(PARSE_ERROR) from None
+
+
+# Array scan states.
+ARRAY_START = 0
+ARRAY_FIRST = 1
+ARRAY_AFTER = 2
+ARRAY_NEXT = 3
+ARRAY_DONE = 4
+
+
+def scan_array(buf: str, state: int, scan: int, depth: int, final: bool) -> tuple[list[Any], str, int, int, int]:
+    """Pull complete elements out of a top-level JSON array held in `buf`.
+
+    Returns `(values, rest, state, scan, depth)` where `rest` is the unconsumed
+    suffix; `scan` and `depth` record how far into an unfinished element of
+    `rest` the scan got and are passed back with the next chunk. Raises
+    `ValueError(PARSE_ERROR)` on malformed input or, when `final`, truncated
+    input.
+    """
+    out: list[Any] = []
+    pos = 0
+    n = len(buf)
+    while True:
+        pos = _WS.match(buf, pos).end()
+        if pos >= n:
+            if final and state != ARRAY_DONE:
+                raise ValueError(PARSE_ERROR)
+            return out, "", state, 0, 0
+        c = buf[pos]
+        if state == ARRAY_START:
+            if c != "[":
+                raise ValueError(PARSE_ERROR)
+            state = ARRAY_FIRST
+            pos += 1
+        elif state == ARRAY_AFTER:
+            if c == ",":
+                state = ARRAY_NEXT
+            elif c == "]":
+                state = ARRAY_DONE
+            else:
+                raise ValueError(PARSE_ERROR)
+            pos += 1
+        elif state == ARRAY_DONE:
+            raise ValueError(PARSE_ERROR)
+        elif c == "]" and state == ARRAY_FIRST:
+            state = ARRAY_DONE
+            pos += 1
+        else:
+            end, scan, depth = _element_end(buf, max(pos, scan), depth)
+            if end < 0:
+                if final:
+                    raise ValueError(PARSE_ERROR)
+                return out, buf[pos:], state, scan - pos, depth
+            out.append(_decode(buf[pos:end]))
+            state = ARRAY_AFTER
+            pos = end
+
+
+def scan_lines(buf: str, line: int, scan: int, final: bool) -> tuple[list[Any], str, int, int]:
+    """Parse the complete JSON Lines records in `buf`.
+
+    `line` is the number of lines consumed before `buf`, and the first `scan`
+    characters of `buf` are known to hold no newline; blank lines are skipped.
+    Returns `(values, rest, line, scan)` and raises `ValueError` naming the
+    1-based line of the first malformed record.
+    """
+    out: list[Any] = []
+    start = 0
+    while True:
+        nl = buf.find("\n", scan)
+        if nl < 0:
+            if not final:
+                return out, buf[start:], line, len(buf) - start
+            nl = len(buf)
+        line += 1
+        text = buf[start:nl].strip(" \t\r")
+        if text:
+            try:
+                out.append(_decode(text))
+            except ValueError:
+                raise ValueError(f"{PARSE_ERROR} at line {line}") from None
+        if nl == len(buf):
+            return out, "", line, 0
+        start = scan = nl + 1
+
+
+__all__ = [
+    "ARRAY_AFTER",
+    "ARRAY_DONE",
+    "ARRAY_FIRST",
+    "ARRAY_NEXT",
+    "ARRAY_START",
+    "LEX_END",
+    "LEX_ERROR",
+    "LEX_NEED_INPUT",
+    "LEX_SCALAR",
+    "LEX_STRING",
+    "PARSE_ERROR",
+    "dumps",
+    "lex_token",
+    "loads",
+    "scan_array",
+    "scan_lines",
+]
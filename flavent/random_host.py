@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+from array import array
+from typing import Any
+
+from . import array_host
+
+# Host-side bulk draws for `stdlib/random`.
+#
+# Every function takes the xorshift32 state of an `Rng`, performs exactly the
+# draws the sequential Flavent API would (`rngNextU32`, `rngNextInt`,
+# `rngNextFloat01`, the Fisher-Yates loop of `rngShuffle`), and returns the
+# results together with the final state, so bulk and one-at-a-time code stay
+# interchangeable for the same seed.
+
+_MASK = 0xFFFFFFFF
+_DENOM = 4294967296.0
+
+
+def _step(x: int) -> int:
+    x = (x ^ (x << 13)) & _MASK
+    x ^= x >> 17
+    return (x ^ (x << 5)) & _MASK
+
+
+def _draws(state: int, n: int) -> tuple[list[int], int]:
+    """`n` successive `rngNextU32` values and the final state."""
+    out = [0] * max(0, n)
+    x = state
+    for i in range(len(out)):
+        x = (x ^ (x << 13)) & _MASK
+        x ^= x >> 17
+        x = (x ^ (x << 5)) & _MASK
+        out[i] = x
+    return out, x
+
+
+def ints(state: int, n: int, lo: int, hi: int) -> tuple[array, int]:
+    """`n` draws of `rngNextInt(lo, hi)`; no draws when `hi <= lo`.
+
+    Raises `ValueError` before drawing when a value could leave the 64-bit
+    range of an `IntArray`.
+    """
+    span = hi - lo
+    if lo < array_host.INT_MIN or (hi - 1 if span > 0 else lo) > array_host.INT_MAX:
+        raise ValueError(array_host.OUT_OF_RANGE)
+    if span <= 0:
+        return array_host.fill(array_host.INT, n, lo), state
+    xs, x = _draws(state, n)
+    return array_host.from_values(array_host.INT, [lo + v % span for v in xs]), x
+
+
+def floats(state: int, n: int, lo: float, hi: float) -> tuple[array, int]:
+    """`n` draws of `rngUniform(lo, hi)`; `rngNextFloat01` for `0.0, 1.0`."""
+    scale = hi - lo
+    xs, x = _draws(state, n)
+    return array(array_host.FLOAT, [lo + scale * (v / _DENOM) for v in xs]), x
+
+
+def random_bytes(state: int, n: int) -> tuple[bytes, int]:
+    """`rngBytes`: the low byte of each of `n` draws."""
+    xs, x = _draws(state, n)
+    return bytes([v & 0xFF for v in xs]), x
+
+
+def shuffle(state: int, items: list[Any]) -> tuple[list[Any], int]:
+    """Fisher-Yates from the back, one `rngNextInt(0, i)` per step (in place)."""
+    x = state
+    for i in range(len(items), 1, -1):
+        x = _step(x)
+        j = x % i
+        items[i - 1], items[j] = items[j], items[i - 1]
+    return items, x
+
+
+__all__ = [
+    "floats",
+    "ints",
+    "random_bytes",
+    "shuffle",
+]
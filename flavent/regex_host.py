@@ -0,0 +1,582 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+
+# Host-side execution of the `stdlib/regex` dialect.
+#
+# The dialect is translated to a Python `re` pattern that preserves its quirks:
+# - a leading `^` anchors the whole pattern at offset 0; any other `^` is literal
+# - `$` anchors only as the last item of a branch/group (and means end of input)
+# - `.` matches any character, `\d` / `\w` / `\s` / `\b` are ASCII-only
+# - any other escape (`\n`, `\{`, ...) is the literal character
+# - unterminated `[` / `(` and stray `)` / quantifiers are literals
+# - groups are numbered by scanning `(` the way `_rxGroupIndexAt` does
+#
+# Compiled patterns are cached per pattern string, so `compile()` and every
+# match call after it only pay for the native search.
+
+_SPACE_CLASS = " \t\n\r"
+
+CACHE_SIZE = 512
+
+
+@dataclass(frozen=True)
+class CompiledRegex:
+    pattern: re.Pattern[str]
+    groups: int
+
+    def group_span(self, m: re.Match[str], idx: int) -> tuple[int, int] | None:
+        name = f"g{idx}"
+        if name not in self.pattern.groupindex:
+            return None
+        a, b = m.span(name)
+        if a < 0:
+            return None
+        return a, b
+
+
+def _find_class_end(pat: str, i: int, end: int) -> int:
+    while i < end:
+        c = pat[i]
+        if c == "\\" and i + 1 < end:
+            i += 2
+            continue
+        if c == "]":
+            return i
+        i += 1
+    return -1
+
+
+def _find_group_close(pat: str, i: int, end: int, depth: int) -> int:
+    while i < end:
+        c = pat[i]
+        if c == "\\" and i + 1 < end:
+            i += 2
+        elif c == "[":
+            j = _find_class_end(pat, i + 1, end)
+            if j < 0:
+                return -1
+            i = j + 1
+        elif c == "(":
+            depth += 1
+            i += 1
+        elif c == ")":
+            if depth == 1:
+                return i
+            depth -= 1
+            i += 1
+        else:
+            i += 1
+    return -1
+
+
+def _find_top_bar(pat: str, i: int, end: int) -> int:
+    depth = 0
+    while i < end:
+        c = pat[i]
+        if c == "\\" and i + 1 < end:
+            i += 2
+        elif c == "[":
+            j = _find_class_end(pat, i + 1, end)
+            if j < 0:
+                return -1
+            i = j + 1
+        elif c == "(":
+            depth += 1
+            i += 1
+        elif c == ")" and depth > 0:
+            depth -= 1
+            i += 1
+        elif c == "|" and depth == 0:
+            return i
+        else:
+            i += 1
+    return -1
+
+
+def _group_index_at(pat: str, target: int) -> int:
+    idx = 0
+    i = 0
+    n = len(pat)
+    while i <= target and i < n:
+        c = pat[i]
+        if c == "\\" and i + 1 < n:
+            i += 2
+        elif c == "[":
+            j = _find_class_end(pat, i + 1, n)
+            if j < 0:
+                return idx
+            i = j + 1
+        elif c == "(":
+            idx += 1
+            if i == target:
+                return idx
+            i += 1
+        else:
+            i += 1
+    return idx
+
+
+def group_count(pat: str) -> int:
+    count = 0
+    i = 0
+    n = len(pat)
+    while i < n:
+        c = pat[i]
+        if c == "\\" and i + 1 < n:
+            i += 2
+        elif c == "[":
+            j = _find_class_end(pat, i + 1, n)
+            if j < 0:
+                return count
+            i = j + 1
+        else:
+            if c == "(":
+                count += 1
+            i += 1
+    return count
+
+
+def _class_item(pat: str, i: int) -> tuple[str, str, int]:
+    # -> (kind, char, next) with kind in {"lit", "d", "w", "s"}
+    c = pat[i]
+    if c == "\\" and i + 1 < len(pat):
+        e = pat[i + 1]
+        if e in "dws":
+            return e, "", i + 2
+        return "lit", e, i + 2
+    return "lit", c, i + 1
+
+
+def _class_set(kind: str, ch: str) -> str:
+    if kind == "d":
+        return "0-9"
+    if kind == "w":
+        return "A-Za-z0-9_"
+    if kind == "s":
+        return re.escape(_SPACE_CLASS)
+    return re.escape(ch)
+
+
+def _parse_class(pat: str, pi: int) -> tuple[str, int] | None:
+    plen = len(pat)
+    invert = pi + 1 < plen and pat[pi + 1] == "^"
+    i = pi + 2 if invert else pi + 1
+    items: list[str] = []
+    if i < plen and pat[i] == "]":
+        items.append(re.escape("]"))
+        i += 1
+    if i < plen and pat[i] == "-":
+        items.append(re.escape("-"))
+        i += 1
+    while True:
+        if i >= plen:
+            return None
+        if pat[i] == "]":
+            i += 1
+            break
+        kind1, ch1, i1 = _class_item(pat, i)
+        if kind1 == "lit" and i1 + 1 < plen and pat[i1] == "-" and pat[i1 + 1] != "]":
+            kind2, ch2, i2 = _class_item(pat, i1 + 1)
+            if kind2 == "lit":
+                # Reversed ranges match nothing in the dialect.
+                if ord(ch1) <= ord(ch2):
+                    items.append(re.escape(ch1) + "-" + re.escape(ch2))
+            else:
+                items.append(re.escape(ch1) + re.escape("-") + _class_set(kind2, ch2))
+            i = i2
+        else:
+            items.append(_class_set(kind1, ch1))
+            i = i1
+    if not items:
+        return ("." if invert else r"[^\x00-\U0010ffff]"), i
+    return "[" + ("^" if invert else "") + "".join(items) + "]", i
+
+
+def _parse_atom(pat: str, pi: int) -> tuple[str, int, bool]:
+    # -> (regex, next, is_boundary)
+    c = pat[pi]
+    plen = len(pat)
+    if c == "[":
+        cls = _parse_class(pat, pi)
+        if cls is not None:
+            return cls[0], cls[1], False
+        return re.escape(c), pi + 1, False
+    if c == "\\":
+        if pi + 1 >= plen:
+            return re.escape(c), pi + 1, False
+        e = pat[pi + 1]
+        if e == "b":
+            return r"\b", pi + 2, True
+        if e in "dws":
+            return "[" + _class_set(e, "") + "]", pi + 2, False
+        return re.escape(e), pi + 2, False
+    if c == ".":
+        return ".", pi + 1, False
+    return re.escape(c), pi + 1, False
+
+
+def _parse_quant(pat: str, i: int, end: int) -> tuple[str, int]:
+    if i >= end or pat[i] not in "*+?":
+        return "", i
+    if i + 1 < end and pat[i + 1] == "?":
+        return pat[i] + "?", i + 2
+    return pat[i], i + 1
+
+
+class _Translator:
+    def __init__(self, pat: str, captures: bool) -> None:
+        self.pat = pat
+        self.captures = captures
+        self.names: set[int] = set()
+
+    def seq(self, pi: int, end: int) -> str:
+        pat = self.pat
+        bar = _find_top_bar(pat, pi, end)
+        if bar >= 0:
+            return "(?:" + self.seq(pi, bar) + "|" + self.seq(bar + 1, end) + ")"
+        out: list[str] = []
+        while pi < end:
+            c0 = pat[pi]
+            if c0 == "$" and pi + 1 == end:
+                out.append(r"\Z")
+                break
+            if c0 == "(":
+                close = _find_group_close(pat, pi + 1, end, 1)
+                if close >= 0:
+                    idx = _group_index_at(pat, pi)
+                    inner = self.seq(pi + 1, close)
+                    if not self.captures or idx in self.names:
+                        out.append("(?:" + inner + ")")
+                    else:
+                        self.names.add(idx)
+                        out.append(f"(?P<g{idx}>" + inner + ")")
+                    q, pi = _parse_quant(pat, close + 1, end)
+                    out.append(q)
+                    continue
+            atom, nxt, boundary = _parse_atom(pat, pi)
+            q, pi = _parse_quant(pat, nxt, end)
+            if boundary and q:
+                # A repeated zero-width assertion: `\b+` is `\b`, `\b*` / `\b?` match empty.
+                out.append(atom if q[0] == "+" else "")
+            else:
+                out.append(atom + q)
+        return "".join(out)
+
+
+def translate(pat: str, *, captures: bool = True) -> str:
+    """Translate a `stdlib/regex` pattern into an equivalent Python `re` pattern."""
+    if pat.startswith("^"):
+        return r"\A(?:" + _Translator(pat, captures).seq(1, len(pat)) + ")"
+    return _Translator(pat, captures).seq(0, len(pat))
+
+
+def _compile(src: str, pat: str) -> re.Pattern[str]:
+    try:
+        return re.compile(src, re.ASCII | re.DOTALL)
+    except re.error as e:
+        raise RuntimeError(f"regex: cannot compile {pat!r}: {e}") from e
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def compile_regex(pat: str) -> CompiledRegex:
+    return CompiledRegex(_compile(translate(pat), pat), group_count(pat))
+
+
+# Regex sets run on their own automaton instead of `re`: the patterns are
+# parsed with the same helpers as `translate` into one Thompson NFA (one accept
+# state per pattern), which is run as a lazily built DFA. A DFA state is the set
+# of NFA states reached at a position (before following `\b` / `$`, which
+# depend on the next character) plus whether the previous character was a word
+# character. Every position re-adds the start states of the unanchored patterns,
+# so one left-to-right pass reports every pattern that matches anywhere.
+
+SET_MAX_STATES = 4096
+
+_CHAR, _SPLIT, _BOUND, _END, _ACCEPT = range(5)
+
+
+def _is_word(c: str) -> bool:
+    return c == "_" or (c.isascii() and c.isalnum())
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _char_matcher(atom: str):
+    return _compile(atom, atom).match
+
+
+class _SetParser:
+    # Mirrors `_Translator.seq`, producing nodes instead of `re` source:
+    # ("cat", items) / ("alt", a, b) / ("char", match) / ("rep", node, op)
+    # / ("bound",) / ("end",)
+    def __init__(self, pat: str) -> None:
+        self.pat = pat
+
+    def seq(self, pi: int, end: int) -> tuple:
+        pat = self.pat
+        bar = _find_top_bar(pat, pi, end)
+        if bar >= 0:
+            return ("alt", self.seq(pi, bar), self.seq(bar + 1, end))
+        items: list[tuple] = []
+        while pi < end:
+            c0 = pat[pi]
+            if c0 == "$" and pi + 1 == end:
+                items.append(("end",))
+                break
+            if c0 == "(":
+                close = _find_group_close(pat, pi + 1, end, 1)
+                if close >= 0:
+                    inner = self.seq(pi + 1, close)
+                    q, pi = _parse_quant(pat, close + 1, end)
+                    items.append(("rep", inner, q[0]) if q else inner)
+                    continue
+            atom, nxt, boundary = _parse_atom(pat, pi)
+            q, pi = _parse_quant(pat, nxt, end)
+            if boundary:
+                if not q or q[0] == "+":
+                    items.append(("bound",))
+            else:
+                node = ("char", _char_matcher(atom))
+                items.append(("rep", node, q[0]) if q else node)
+        return ("cat", items)
+
+
+class _SetAutomaton:
+    def __init__(self, patterns: tuple[str, ...]) -> None:
+        self.ops: list[int] = []
+        self.args: list[object] = []
+        self.outs: list[object] = []
+        self.count = len(patterns)
+        starts: list[int] = []
+        rescan: list[int] = []
+        for idx, pat in enumerate(patterns):
+            anchored = pat.startswith("^")
+            tree = _SetParser(pat).seq(1 if anchored else 0, len(pat))
+            start = self._emit(tree, self._add(_ACCEPT, idx, None))
+            starts.append(start)
+            if not anchored:
+                rescan.append(start)
+        self.rescan = frozenset(rescan)
+        self.states: dict[tuple[frozenset[int], bool], _SetState] = {}
+        self.initial = self._state(frozenset(starts), False)
+
+    def _add(self, op: int, arg: object, out: object) -> int:
+        self.ops.append(op)
+        self.args.append(arg)
+        self.outs.append(out)
+        return len(self.ops) - 1
+
+    def _emit(self, node: tuple, nxt: int) -> int:
+        # Builds back to front: `nxt` is the state that follows `node`.
+        kind = node[0]
+        if kind == "cat":
+            for item in reversed(node[1]):
+                nxt = self._emit(item, nxt)
+            return nxt
+        if kind == "alt":
+            return self._add(_SPLIT, None, (self._emit(node[1], nxt), self._emit(node[2], nxt)))
+        if kind == "char":
+            return self._add(_CHAR, node[1], nxt)
+        if kind == "bound":
+            return self._add(_BOUND, None, nxt)
+        if kind == "end":
+            return self._add(_END, None, nxt)
+        body, op = node[1], node[2]
+        if op == "?":
+            return self._add(_SPLIT, None, (self._emit(body, nxt), nxt))
+        loop = self._add(_SPLIT, None, None)
+        first = self._emit(body, loop)
+        self.outs[loop] = (first, nxt)
+        return loop if op == "*" else first
+
+    def _state(self, kernel: frozenset[int], word: bool) -> _SetState:
+        key = (kernel, word)
+        st = self.states.get(key)
+        if st is None:
+            if len(self.states) >= SET_MAX_STATES:
+                # Start over rather than grow without bound; states are rebuilt on demand.
+                for old in self.states.values():
+                    old.trans.clear()
+                self.states.clear()
+            st = self.states[key] = _SetState(kernel, word)
+        return st
+
+    def _closure(self, kernel: frozenset[int], prev: bool, nxt: bool, at_end: bool) -> tuple[list[int], frozenset[int]]:
+        ops, outs = self.ops, self.outs
+        seen = set(kernel)
+        stack = list(kernel)
+        chars: list[int] = []
+        hits: set[int] = set()
+        while stack:
+            i = stack.pop()
+            op = ops[i]
+            if op == _CHAR:
+                chars.append(i)
+                continue
+            if op == _ACCEPT:
+                hits.add(self.args[i])
+                continue
+            if op == _SPLIT:
+                targets = outs[i]
+            elif (op == _BOUND and prev != nxt) or (op == _END and at_end):
+                targets = (outs[i],)
+            else:
+                continue
+            for t in targets:
+                if t not in seen:
+                    seen.add(t)
+                    stack.append(t)
+        return chars, frozenset(hits)
+
+    def _step(self, st: _SetState, c: str) -> tuple[_SetState, frozenset[int]]:
+        word = _is_word(c)
+        chars, hits = self._closure(st.kernel, st.word, word, False)
+        kernel = set(self.rescan)
+        for i in chars:
+            if self.args[i](c):
+                kernel.add(self.outs[i])
+        out = (self._state(frozenset(kernel), word), hits)
+        st.trans[c] = out
+        return out
+
+    def _final(self, st: _SetState) -> frozenset[int]:
+        if st.final is None:
+            st.final = self._closure(st.kernel, st.word, False, True)[1]
+        return st.final
+
+    def scan(self, s: str, first: bool) -> set[int]:
+        """Indices of the patterns matching somewhere in `s` (stops at the first hit if `first`)."""
+        found: set[int] = set()
+        if not self.count:
+            return found
+        st = self.initial
+        for c in s:
+            step = st.trans.get(c)
+            st, hits = step if step is not None else self._step(st, c)
+            if hits:
+                found |= hits
+                if first or len(found) == self.count:
+                    return found
+        found |= self._final(st)
+        return found
+
+
+class _SetState:
+    __slots__ = ("kernel", "word", "trans", "final")
+
+    def __init__(self, kernel: frozenset[int], word: bool) -> None:
+        self.kernel = kernel
+        self.word = word
+        self.trans: dict[str, tuple[_SetState, frozenset[int]]] = {}
+        self.final: frozenset[int] | None = None
+
+
+@dataclass(frozen=True)
+class CompiledRegexSet:
+    """Many patterns compiled into one automaton.
+
+    `matches` and `is_match` read the input once, left to right, whatever the
+    number of patterns; DFA states are built on first use and cached with the
+    set.
+    """
+
+    patterns: tuple[str, ...]
+    automaton: _SetAutomaton
+
+    def matches(self, s: str) -> list[int]:
+        return sorted(self.automaton.scan(s, False))
+
+    def is_match(self, s: str) -> bool:
+        return bool(self.automaton.scan(s, True))
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def compile_regex_set(patterns: tuple[str, ...]) -> CompiledRegexSet:
+    return CompiledRegexSet(tuple(patterns), _SetAutomaton(tuple(patterns)))
+
+
+def find_spans(rx: CompiledRegex, s: str) -> list[tuple[int, int]]:
+    # Mirrors `findAllSpans`: an empty match advances the scan by one position.
+    out: list[tuple[int, int]] = []
+    pos = 0
+    n = len(s)
+    while pos <= n:
+        m = rx.pattern.search(s, pos)
+        if m is None:
+            break
+        a, b = m.span()
+        out.append((a, b))
+        pos = b if b > a else a + 1
+    return out
+
+
+def captures(rx: CompiledRegex, s: str, m: re.Match[str]) -> list[str]:
+    out = [m.group(0)]
+    for idx in range(1, rx.groups + 1):
+        sp = rx.group_span(m, idx)
+        out.append("" if sp is None else s[sp[0] : sp[1]])
+    return out
+
+
+def expand_replacement(repl: str, groups: list[str]) -> str:
+    # `$$` -> `$`, `$<digits>` -> group (missing groups are empty), lone `$` stays.
+    out: list[str] = []
+    i = 0
+    n = len(repl)
+    while i < n:
+        c = repl[i]
+        if c == "$" and i + 1 < n:
+            if repl[i + 1] == "$":
+                out.append("$")
+                i += 2
+                continue
+            j = i + 1
+            while j < n and "0" <= repl[j] <= "9":
+                j += 1
+            if j > i + 1:
+                idx = int(repl[i + 1 : j])
+                out.append(groups[idx] if idx < len(groups) else "")
+                i = j
+                continue
+        out.append(c)
+        i += 1
+    return "".join(out)
+
+
+def replace(rx: CompiledRegex, s: str, repl: str, count: int) -> str:
+    """Replace up to `count` matches (0 = all), scanning like `findAllSpans`."""
+    out: list[str] = []
+    last = 0
+    pos = 0
+    n = len(s)
+    done = 0
+    while pos <= n and (count <= 0 or done < count):
+        m = rx.pattern.search(s, pos)
+        if m is None:
+            break
+        a, b = m.span()
+        out.append(s[last:a])
+        out.append(expand_replacement(repl, captures(rx, s, m)))
+        last = b
+        done += 1
+        pos = b if b > a else a + 1
+    out.append(s[last:])
+    return "".join(out)
+
+
+__all__ = [
+    "CACHE_SIZE",
+    "SET_MAX_STATES",
+    "CompiledRegex",
+    "CompiledRegexSet",
+    "captures",
+    "compile_regex",
+    "compile_regex_set",
+    "expand_replacement",
+    "find_spans",
+    "group_count",
+    "replace",
+    "translate",
+]
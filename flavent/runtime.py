@@ -1,10 +1,13 @@
 from __future__ import annotations
 
+import codecs
+import hashlib
 import heapq
 from collections import deque
-from dataclasses import dataclass
-from typing import Any, Generator, Optional
+from dataclasses import dataclass, field
+from typing import Any, Generator, Mapping, Optional
 
+from . import array_host, base64_host, bytes_host, collections_host, csv_host, datetime_host, json_host, random_host, regex_host, string_host, struct_host
 from .diagnostics import EffectError
 from .hir import (
     AbortHandlerStmt,
@@ -48,6 +51,8 @@ from .hir import (
     PVar,
     PBool,
     PWildcard,
+    TypeApp,
+    TypeVar,
 )
 from .resolve import Resolution
 from .symbols import Symbol, SymbolId, SymbolKind
@@ -68,16 +73,245 @@ class Bridge:
         raise RuntimeError(f"bridge call not allowed in runtime tests: {name}({len(args)} args)")
 
 
+# Pure hash primitives served by the host `hashlib`: name -> (algorithm, hex output).
+_HASH_PRIMITIVES: dict[str, tuple[str, bool]] = {
+    "_pyMd5Digest": ("md5", False),
+    "_pyMd5Hex": ("md5", True),
+    "_pySha1Digest": ("sha1", False),
+    "_pySha1Hex": ("sha1", True),
+    "_pySha512Digest": ("sha512", False),
+    "_pySha512Hex": ("sha512", True),
+}
+# Algorithms accepted by the by-name primitives (`_pyHashDigest`, `_pyHasherNew`, ...).
+_HASH_ALGORITHMS = frozenset(("md5", "sha1", "sha256", "sha512"))
+
+
+QUEUE_POLICIES = ("block", "drop_oldest", "drop_newest", "fail")
+
+# Default step budgets of `run_hir_program` (counted in executed statements).
+# The run cap turns a runaway program, such as an event cycle that never
+# stops, into a runtime error instead of a hang; the preemption budget keeps a
+# long loop in one sector from starving the others. Pass None to disable.
+DEFAULT_MAX_STEPS = 1_000_000
+DEFAULT_PREEMPT_BUDGET = 1_000
+
+
+@dataclass(frozen=True)
+class QueueLimit:
+    """Capacity limit for one event type's dispatch queue.
+
+    When the queue is full, `policy` decides what happens to a new event:
+    - `block`: suspend the emitting task until the queue has room,
+    - `drop_oldest`: discard the oldest queued event,
+    - `drop_newest`: discard the event being emitted,
+    - `fail`: stop the run with a runtime error.
+    """
+
+    capacity: int
+    policy: str = "block"  # one of QUEUE_POLICIES
+
+
+def parse_queue_limit(spec: str) -> tuple[str, QueueLimit]:
+    """Parse `Event.X=CAPACITY[:POLICY]` (as given on the command line)."""
+    name, sep, rest = spec.partition("=")
+    cap, _, policy = rest.partition(":")
+    if not sep or not name or not cap.isdigit():
+        raise ValueError(f"invalid queue limit (expected Event.X=CAPACITY[:POLICY]): {spec}")
+    policy = policy or "block"
+    if policy not in QUEUE_POLICIES:
+        raise ValueError(f"unknown queue policy for {name}: {policy}")
+    return name, QueueLimit(int(cap), policy)
+
+
+def parse_named_int(spec: str, what: str) -> tuple[str, int]:
+    """Parse `NAME=N` (as given on the command line); `what` names the option in errors."""
+    name, sep, n = spec.partition("=")
+    if not sep or not name or not n.isdigit():
+        raise ValueError(f"invalid {what} (expected NAME=N): {spec}")
+    return name, int(n)
+
+
+@dataclass
+class QueueStats:
+    enqueued: int = 0
+    dispatched: int = 0
+    batches: int = 0
+    dropped: int = 0
+    blocked: int = 0
+    high_water: int = 0
+
+
+@dataclass
+class RuntimeStats:
+    """Counters filled in by `run_hir_program` when passed as `stats=`."""
+
+    queues: dict[str, QueueStats] = field(default_factory=dict)
+    steps: int = 0
+    yields: int = 0
+
+
+class _WeightedRoundRobin:
+    """Deterministic smooth weighted round-robin over a changing set of ready keys.
+
+    Over any window where the same keys stay ready, each key is picked in
+    proportion to its weight, and picks are interleaved rather than bursty.
+    Ties go to the key listed first in `ready`.
+    """
+
+    def __init__(self, weights: Mapping[Any, int], default: int = 1):
+        self.weights = dict(weights)
+        self.default = default
+        self.current: dict[Any, int] = {}
+
+    def pick(self, ready: list[Any]) -> Any:
+        total = 0
+        best = None
+        best_cur = 0
+        for k in ready:
+            w = self.weights.get(k, self.default)
+            cur = self.current.get(k, 0) + w
+            self.current[k] = cur
+            total += w
+            if best is None or cur > best_cur:
+                best, best_cur = k, cur
+        self.current[best] = best_cur - total
+        return best
+
+
+class _DispatchOrder:
+    """Chooses which event type to dispatch next.
+
+    Event types are grouped into lanes by priority. Within a lane the smallest
+    TypeId goes first; across lanes a weighted round-robin (weight = priority)
+    is used. Without priorities there is a single lane, which is the original
+    "smallest TypeId first" order.
+    """
+
+    def __init__(self, priority_by_tid: Mapping[int, int] | None = None):
+        self.priority_by_tid = dict(priority_by_tid or {})
+        # lane priority -> (heap of type ids, type ids in heap)
+        self.lanes: dict[int, tuple[list[int], set[int]]] = {}
+        self.lane_order: list[int] = []
+        self.rr = _WeightedRoundRobin({}) if self.priority_by_tid else None
+
+    def add(self, tid: int) -> None:
+        prio = self.priority_by_tid.get(tid, 1)
+        lane = self.lanes.get(prio)
+        if lane is None:
+            lane = ([], set())
+            self.lanes[prio] = lane
+            self.lane_order = sorted(self.lanes, reverse=True)
+            if self.rr is not None:
+                self.rr.weights[prio] = prio
+        heap, members = lane
+        if tid not in members:
+            heapq.heappush(heap, tid)
+            members.add(tid)
+
+    def remove(self, tid: int) -> None:
+        heap, members = self.lanes[self.priority_by_tid.get(tid, 1)]
+        if heap and heap[0] == tid:
+            heapq.heappop(heap)
+            members.discard(tid)
+
+    def select(self, queues: Mapping[int, deque[Any]]) -> int | None:
+        ready: list[int] = []
+        for prio in self.lane_order:
+            heap, members = self.lanes[prio]
+            while heap and not queues.get(heap[0]):
+                members.discard(heapq.heappop(heap))
+            if heap:
+                ready.append(prio)
+        if not ready:
+            return None
+        prio = ready[0] if self.rr is None or len(ready) == 1 else self.rr.pick(ready)
+        return self.lanes[prio][0][0]
+
+
+class _SectorRunQueue:
+    """Runnable tasks kept per sector and served by weighted round-robin.
+
+    Used instead of a plain FIFO deque when sector weights are configured;
+    tasks of one sector still run in FIFO order.
+    """
+
+    def __init__(self, weights: Mapping[Any, int]):
+        self.queues: dict[Any, deque[Any]] = {}
+        self.order: list[Any] = []
+        self.rr = _WeightedRoundRobin(weights)
+        self.size = 0
+
+    def append(self, task: Any) -> None:
+        q = self.queues.get(task.sector)
+        if q is None:
+            q = deque()
+            self.queues[task.sector] = q
+            self.order.append(task.sector)
+        q.append(task)
+        self.size += 1
+
+    def popleft(self) -> Any:
+        ready = [k for k in self.order if self.queues[k]]
+        if not ready:
+            raise IndexError("pop from an empty run queue")
+        key = ready[0] if len(ready) == 1 else self.rr.pick(ready)
+        self.size -= 1
+        return self.queues[key].popleft()
+
+    def __len__(self) -> int:
+        return self.size
+
+
 def run_hir_program(
     hir: Program,
     res: Resolution,
     *,
     entry_event_type: str | None = None,
     bridge: Bridge | None = None,
+    queue_limits: Mapping[str, QueueLimit] | None = None,
+    stats: RuntimeStats | None = None,
+    preempt_budget: int | None = DEFAULT_PREEMPT_BUDGET,
+    max_steps: int | None = DEFAULT_MAX_STEPS,
+    handler_step_budget: int | None = None,
+    event_priorities: Mapping[str, int] | None = None,
+    sector_weights: Mapping[str, int] | None = None,
+    batch_sizes: Mapping[str, int] | None = None,
 ) -> None:
     """Execute a minimal subset of Flavent by interpreting HIR.
 
     This is intentionally small (MVP) and is meant to support flvtest runtime tests.
+
+    `queue_limits` bounds the dispatch queue of selected event types (keyed by
+    type name, e.g. `"Event.Tick"`). Events handed directly to an `await`-ing
+    task never enter a queue and are not limited. Queue counters are recorded
+    in `stats.queues` when `stats` is given.
+
+    Scheduling is cooperative. A step is one executed statement. `yield`
+    always hands control back to the scheduler, and a task is also preempted
+    at the next loop back-edge or function entry once it has run
+    `preempt_budget` steps in its current slice. `max_steps` bounds the whole
+    run and `handler_step_budget` bounds each handler task (including the
+    functions it calls); exceeding either raises a runtime error. By default
+    preemption is on and the run is capped (`DEFAULT_PREEMPT_BUDGET`,
+    `DEFAULT_MAX_STEPS`); pass None to turn either off.
+
+    By default queued events are dispatched smallest TypeId first and runnable
+    tasks run FIFO. `event_priorities` (event type name -> positive priority,
+    default 1) puts event types into priority lanes served by weighted
+    round-robin, so a priority-4 lane gets four dispatches per one of a
+    priority-1 lane while both have work. `sector_weights` (sector name ->
+    positive weight, default 1) likewise shares scheduler slices between
+    sectors. Both orders stay deterministic.
+
+    `batch_sizes` (event type name -> N) opts event types into batched
+    dispatch: up to N queued events are drained at once and each selected
+    handler runs over its events in one task, reusing its env and generator
+    instead of allocating a task per event. Within a batch a handler sees all
+    of its events before the next handler starts, and the task counts as one
+    handler task for `handler_step_budget`. Keyed `when` guards
+    (`ev == <const>`) are matched when the batch is drained; other guards are
+    evaluated as the handler reaches each event, after the previous events
+    ran.
     """
 
     if bridge is None:
@@ -127,6 +361,42 @@ def run_hir_program(
             except Exception:
                 return "0.0"
 
+        # String scanning (host `str` methods, edge cases as in string_host)
+        if name == "_pyStrFind":
+            return string_host.find(str(args[0]), str(args[1]), int(args[2]))
+        if name == "_pyStrRFind":
+            return string_host.rfind(str(args[0]), str(args[1]), int(args[2]))
+        if name == "_pyStrStartsWith":
+            return str(args[0]).startswith(str(args[1]))
+        if name == "_pyStrEndsWith":
+            return str(args[0]).endswith(str(args[1]))
+        if name == "_pyStrSplit":
+            return list_from_py(string_host.split(str(args[0]), str(args[1])))
+        if name == "_pyStrJoin":
+            return str(args[1]).join(str(x) for x in list_to_py(args[0]))
+        if name == "_pyStrReplace":
+            return string_host.replace(str(args[0]), str(args[1]), str(args[2]), int(args[3]))
+        if name == "_pyStrStrip":
+            return string_host.strip(str(args[0]), str(args[1]), int(args[2]))
+        if name == "_pyStrLowerAscii":
+            return string_host.lower_ascii(str(args[0]))
+        if name == "_pyStrUpperAscii":
+            return string_host.upper_ascii(str(args[0]))
+
+        # String builder (host piece list, value semantics; see string_host)
+        if name == "_pyStrBuilderNew":
+            return string_host.new_builder()
+        if name == "_pyStrBuilderAppend":
+            return args[0].append(str(args[1]))
+        if name == "_pyStrBuilderAppendAll":
+            return args[0].append_all(str(x) for x in list_to_py(args[1]))
+        if name == "_pyStrBuilderLen":
+            return len(args[0])
+        if name == "_pyStrBuilderBuild":
+            return args[0].build()
+        if name == "_pyStrConcatAll":
+            return "".join(str(x) for x in list_to_py(args[0]))
+
         # Bytes primitives (Bytes represented as python bytes)
         if name == "_pyBytesLen":
             return len(bytes(args[0]))
@@ -151,6 +421,349 @@ def run_hir_program(
             x = int(args[0]) & 0xFF
             return bytes([x])
 
+        # Bulk random draws (see random_host)
+        if name == "_pyRngInts":
+            try:
+                data, state = random_host.ints(int(args[0]), int(args[1]), int(args[2]), int(args[3]))
+            except ValueError as e:
+                return make_sum("Err", [str(e)])
+            return make_sum("Ok", [{"data": data, "state": state}])
+        if name == "_pyRngFloats":
+            data, state = random_host.floats(int(args[0]), int(args[1]), float(args[2]), float(args[3]))
+            return {"data": data, "state": state}
+        if name == "_pyRngBytes":
+            data, state = random_host.random_bytes(int(args[0]), int(args[1]))
+            return {"data": data, "state": state}
+        if name == "_pyRngShuffleVec":
+            items, state = random_host.shuffle(int(args[0]), args[1].items())
+            return {"data": collections_host.new_vector(items), "state": state}
+
+        # Dates and epoch conversions (see datetime_host)
+        if name == "_pyDtParseDate":
+            try:
+                return make_sum("Ok", [datetime_host.parse_date(str(args[0]))])
+            except ValueError as e:
+                return make_sum("Err", [str(e)])
+        if name == "_pyDtParseTime":
+            try:
+                return make_sum("Ok", [datetime_host.parse_time(str(args[0]))])
+            except ValueError as e:
+                return make_sum("Err", [str(e)])
+        if name == "_pyDtParseDateTime":
+            try:
+                return make_sum("Ok", [datetime_host.parse_datetime(str(args[0]))])
+            except ValueError as e:
+                return make_sum("Err", [str(e)])
+        if name == "_pyDtFormatDate":
+            return datetime_host.format_date(*(int(x) for x in args))
+        if name == "_pyDtFormatTime":
+            return datetime_host.format_time(*(int(x) for x in args))
+        if name == "_pyDtDaysFromCivil":
+            return datetime_host.days_from_civil(*(int(x) for x in args))
+        if name == "_pyDtCivilFromDays":
+            return datetime_host.civil_from_days(int(args[0]))
+        if name == "_pyDtToEpochMillis":
+            return datetime_host.to_epoch_millis(*(int(x) for x in args))
+        if name == "_pyDtFromEpochMillis":
+            return datetime_host.from_epoch_millis(int(args[0]))
+
+        # Struct packing (see struct_host)
+        if name == "_pyStructCalcSize":
+            try:
+                return make_sum("Ok", [struct_host.calcsize(str(args[0]))])
+            except ValueError as e:
+                return make_sum("Err", [str(e)])
+        if name == "_pyStructPack":
+            try:
+                return make_sum("Ok", [struct_host.pack(str(args[0]), list_to_py(args[1]))])
+            except ValueError as e:
+                return make_sum("Err", [str(e)])
+        if name == "_pyStructUnpackFrom":
+            try:
+                xs = struct_host.unpack_from(str(args[0]), bytes(args[1]), int(args[2]))
+            except ValueError as e:
+                return make_sum("Err", [str(e)])
+            return make_sum("Ok", [list_from_py(xs)])
+
+        # Bytes views and byte buffers (see bytes_host)
+        if name == "_pyBytesView":
+            return bytes_host.view(args[0])
+        if name == "_pyBytesViewLen":
+            return len(args[0])
+        if name == "_pyBytesViewGet":
+            return args[0].get(int(args[1]))
+        if name == "_pyBytesViewSlice":
+            return args[0].slice(int(args[1]), int(args[2]))
+        if name == "_pyBytesViewFind":
+            return args[0].find(bytes(args[1]), int(args[2]))
+        if name == "_pyBytesViewToBytes":
+            return args[0].to_bytes()
+        if name == "_pyByteBufNew":
+            return bytes_host.new_buffer()
+        if name == "_pyByteBufPush":
+            return args[0].push(int(args[1]))
+        if name == "_pyByteBufPushAll":
+            return args[0].push_all(int(x) for x in list_to_py(args[1]))
+        if name == "_pyByteBufAppend":
+            return args[0].append(bytes(args[1]))
+        if name == "_pyByteBufAppendAll":
+            return args[0].append_all(bytes(x) for x in list_to_py(args[1]))
+        if name == "_pyByteBufAppendView":
+            return args[0].append(args[1].memory())
+        if name == "_pyByteBufLen":
+            return len(args[0])
+        if name == "_pyByteBufFreeze":
+            return args[0].freeze()
+
+        # Hash primitives
+        hp = _HASH_PRIMITIVES.get(name)
+        if hp is not None:
+            h = hashlib.new(hp[0], bytes(args[0]))
+            return h.hexdigest() if hp[1] else h.digest()
+        if name == "_pyHashDigest" or name == "_pyHashHex":
+            algo = str(args[0])
+            if algo not in _HASH_ALGORITHMS:
+                raise RuntimeError(f"unsupported hash algorithm: {algo}")
+            h = hashlib.new(algo, bytes(args[1]))
+            return h.hexdigest() if name == "_pyHashHex" else h.digest()
+
+        # Incremental hash state. Updates copy the host object so earlier
+        # `Hasher` values stay valid (value semantics); the copy is O(1).
+        if name == "_pyHasherNew":
+            algo = str(args[0])
+            if algo not in _HASH_ALGORITHMS:
+                raise RuntimeError(f"unsupported hash algorithm: {algo}")
+            return hashlib.new(algo)
+        if name == "_pyHasherUpdate":
+            h = args[0].copy()
+            h.update(bytes(args[1]))
+            return h
+        if name == "_pyHasherDigest":
+            return args[0].digest()
+        if name == "_pyHasherHex":
+            return args[0].hexdigest()
+
+        # Regex primitives (host `re`, compiled patterns cached by pattern string)
+        if name == "_pyRegexSetCompile":
+            return regex_host.compile_regex_set(tuple(str(p) for p in list_to_py(args[0])))
+        if name == "_pyRegexSetMatches":
+            return list_from_py(args[0].matches(str(args[1])))
+        if name == "_pyRegexSetIsMatch":
+            return args[0].is_match(str(args[1]))
+        if name.startswith("_pyRegex"):
+            rx = regex_host.compile_regex(str(args[0]))
+            if name == "_pyRegexCompile":
+                return rx.groups
+            if name == "_pyRegexIsMatch":
+                return rx.pattern.search(str(args[1])) is not None
+            if name == "_pyRegexSearch":
+                s = str(args[1])
+                m = rx.pattern.search(s, max(0, int(args[2])))
+                if m is None:
+                    return list_from_py([])
+                flat = [m.start(), m.end()]
+                for idx in range(1, rx.groups + 1):
+                    flat.extend(rx.group_span(m, idx) or (-1, -1))
+                return list_from_py(flat)
+            if name == "_pyRegexSpans":
+                return list_from_py([x for sp in regex_host.find_spans(rx, str(args[1])) for x in sp])
+            if name == "_pyRegexCaptures":
+                s = str(args[1])
+                m = rx.pattern.search(s)
+                return list_from_py([] if m is None else regex_host.captures(rx, s, m))
+            if name == "_pyRegexReplace":
+                return regex_host.replace(rx, str(args[1]), str(args[2]), int(args[3]))
+
+        # JSON primitives (host `json`, same JsonValue trees as the pure codec)
+        if name == "_pyJsonLoads":
+            ok, v = json_host.loads(str(args[0]))
+            return make_sum("Ok", [v]) if ok else make_sum("Err", [v])
+        if name == "_pyJsonDumps":
+            return json_host.dumps(args[0])
+        if name == "_pyJsonLex":
+            kind, nxt, text, value = json_host.lex_token(str(args[0]), int(args[1]), bool(args[2]))
+            return {"kind": kind, "next": nxt, "text": text, "value": value}
+        if name == "_pyJsonScanArray":
+            try:
+                values, rest, state, scan, depth = json_host.scan_array(
+                    str(args[0]), int(args[1]), int(args[2]), int(args[3]), bool(args[4])
+                )
+            except ValueError as e:
+                return make_sum("Err", [str(e)])
+            return make_sum("Ok", [{"values": list_from_py(values), "rest": rest, "state": state, "scan": scan, "depth": depth}])
+        if name == "_pyJsonScanLines":
+            try:
+                values, rest, state, scan = json_host.scan_lines(str(args[0]), int(args[1]), int(args[2]), bool(args[3]))
+            except ValueError as e:
+                return make_sum("Err", [str(e)])
+            return make_sum("Ok", [{"values": list_from_py(values), "rest": rest, "state": state, "scan": scan, "depth": 0}])
+        if name == "_pyUtf8DecodeChunk":
+            data = bytes(args[0]) + bytes(args[1])
+            dec = codecs.getincrementaldecoder("utf-8")()
+            try:
+                text = dec.decode(data, final=bool(args[2]))
+            except UnicodeDecodeError:
+                return make_sum("Err", ["invalid utf-8"])
+            return make_sum("Ok", [{"text": text, "pending": dec.getstate()[0]}])
+
+        # Base64 (see base64_host)
+        if name == "_pyB64Encode":
+            return base64_host.encode(bytes(args[0]), bool(args[1]))
+        if name == "_pyB64Decode":
+            return base64_host.decode(str(args[0]), bool(args[1]))
+        if name == "_pyB64DecodeChecked":
+            try:
+                return make_sum("Ok", [base64_host.decode_strict(str(args[0]), bool(args[1]))])
+            except ValueError as e:
+                return make_sum("Err", [str(e)])
+        if name == "_pyB64EncodeChunk":
+            text, rest = base64_host.encode_chunk(bytes(args[0]), bytes(args[1]), bool(args[2]), bool(args[3]))
+            return {"text": text, "pending": rest}
+        if name == "_pyB64DecodeChunk":
+            try:
+                data, rest = base64_host.decode_chunk(str(args[0]), str(args[1]), bool(args[2]), bool(args[3]))
+            except ValueError as e:
+                return make_sum("Err", [str(e)])
+            return make_sum("Ok", [{"data": data, "pending": rest}])
+
+        # CSV primitives (host tokenizer for csv.stream, row encoder)
+        if name == "_pyCsvScan":
+            try:
+                rows, rest, scan, quoted = csv_host.scan_records(
+                    str(args[0]), str(args[1]), str(args[2]), int(args[3]), bool(args[4]), bool(args[5])
+                )
+            except ValueError as e:
+                return make_sum("Err", [str(e)])
+            rows_v = list_from_py([list_from_py(r) for r in rows])
+            return make_sum("Ok", [{"rows": rows_v, "rest": rest, "scan": scan, "quoted": quoted}])
+        if name == "_pyCsvEncodeRow":
+            return csv_host.encode_row([str(x) for x in list_to_py(args[0])], str(args[1]), str(args[2]))
+
+        # Stable sorts (Timsort, ordered by Python `<` like the `<` operator)
+        if name == "_pySortList":
+            return list_from_py(sorted(list_to_py(args[0])))
+        if name == "_pySortByKey":
+            return list_from_py([it["value"] for it in sorted(list_to_py(args[0]), key=lambda it: it["key"])])
+
+        # Persistent heap, deque and vector (host arrays shared between versions; see collections_host)
+        if name == "_pyHeapNew":
+            return collections_host.new_heap()
+        if name == "_pyHeapPush":
+            return args[0].push(int(args[1]), args[2])
+        if name == "_pyHeapPushAll":
+            return args[0].push_all((int(it["priority"]), it["value"]) for it in list_to_py(args[1]))
+        if name == "_pyHeapPop":
+            return args[0].pop()
+        if name == "_pyHeapPeek":
+            top = args[0].peek()
+            return make_sum("None", []) if top is None else make_sum("Some", [{"priority": top[0], "value": top[1]}])
+        if name == "_pyHeapLen":
+            return len(args[0])
+        if name == "_pyHeapItems":
+            return list_from_py([{"priority": p, "value": v} for p, v in args[0].items()])
+        if name == "_pyDequeNew":
+            return collections_host.new_deque()
+        if name == "_pyDequeFromList":
+            return collections_host.new_deque(list_to_py(args[0]))
+        if name == "_pyDequePushFront":
+            return args[0].push_front(args[1])
+        if name == "_pyDequePushBack":
+            return args[0].push_back(args[1])
+        if name == "_pyDequePushAllFront":
+            return args[0].push_front_all(list_to_py(args[1]))
+        if name == "_pyDequePushAllBack":
+            return args[0].push_back_all(list_to_py(args[1]))
+        if name == "_pyDequeConcat":
+            return args[0].push_back_all(args[1].items())
+        if name == "_pyDequePopFront":
+            return args[0].pop_front()
+        if name == "_pyDequePopBack":
+            return args[0].pop_back()
+        if name in ("_pyDequePeekFront", "_pyDequePeekBack"):
+            if not len(args[0]):
+                return make_sum("None", [])
+            return make_sum("Some", [args[0].peek_front() if name == "_pyDequePeekFront" else args[0].peek_back()])
+        if name == "_pyDequeLen":
+            return len(args[0])
+        if name == "_pyDequeItems":
+            return list_from_py(args[0].items())
+        if name == "_pyVecNew":
+            return collections_host.new_vector()
+        if name == "_pyVecFromList":
+            return collections_host.new_vector(list_to_py(args[0]))
+        if name == "_pyVecLen":
+            return len(args[0])
+        if name == "_pyVecGet":
+            found, x = args[0].get(int(args[1]))
+            return make_sum("Some", [x]) if found else make_sum("None", [])
+        if name == "_pyVecSet":
+            return args[0].set(int(args[1]), args[2])
+        if name == "_pyVecSwap":
+            return args[0].swap(int(args[1]), int(args[2]))
+        if name == "_pyVecPush":
+            return args[0].push(args[1])
+        if name == "_pyVecPushAll":
+            return args[0].push_all(list_to_py(args[1]))
+        if name == "_pyVecConcat":
+            return args[0].push_all(args[1].items())
+        if name == "_pyVecPop":
+            return args[0].pop()
+        if name == "_pyVecSlice":
+            return args[0].slice(int(args[1]), int(args[2]))
+        if name == "_pyVecItems":
+            return list_from_py(args[0].items())
+        if name == "_pyVecSort":
+            return args[0].sorted()
+
+        # Typed numeric arrays (immutable host `array` buffers; see array_host)
+        if name == "_pyArrEmpty":
+            return array_host.empty(array_host.typecode(str(args[0])))
+        if name in ("_pyArrFromList", "_pyArrFill", "_pyArrRange", "_pyArrScalar", "_pyArrCumSum"):
+            # Builders: an int value outside the 64-bit range is an `Err`.
+            try:
+                if name == "_pyArrFromList":
+                    out = array_host.from_values(array_host.typecode(str(args[1])), list_to_py(args[0]))
+                elif name == "_pyArrFill":
+                    out = array_host.fill(array_host.typecode(str(args[2])), int(args[0]), args[1])
+                elif name == "_pyArrRange":
+                    out = array_host.int_range(int(args[0]), int(args[1]))
+                elif name == "_pyArrScalar":
+                    out = array_host.scalar(args[0], str(args[1]), args[2])
+                else:
+                    out = array_host.cumsum(args[0])
+            except ValueError as e:
+                return make_sum("Err", [str(e)])
+            return make_sum("Ok", [out])
+        if name == "_pyArrToList":
+            return list_from_py(args[0].tolist())
+        if name == "_pyArrToFloat":
+            return array_host.to_float(args[0])
+        if name == "_pyArrLen":
+            return len(args[0])
+        if name == "_pyArrGet":
+            found, x = array_host.get(args[0], int(args[1]))
+            return make_sum("Some", [x]) if found else make_sum("None", [])
+        if name == "_pyArrZip":
+            try:
+                return make_sum("Ok", [array_host.zip_with(args[0], args[1], str(args[2]))])
+            except ValueError as e:
+                return make_sum("Err", [str(e)])
+        if name == "_pyArrSum":
+            return array_host.total(args[0])
+        if name in ("_pyArrMin", "_pyArrMax"):
+            if not len(args[0]):
+                return make_sum("None", [])
+            return make_sum("Some", [min(args[0]) if name == "_pyArrMin" else max(args[0])])
+        if name == "_pyArrMean":
+            return array_host.mean(args[0])
+        if name == "_pyArrVariance":
+            return array_host.variance(args[0])
+        if name == "_pyArrHistogram":
+            try:
+                return make_sum("Ok", [array_host.histogram(args[0], float(args[1]), float(args[2]), int(args[3]))])
+            except ValueError as e:
+                return make_sum("Err", [str(e)])
+
         # U32 primitives: wrap to 32-bit unsigned range
         mask = 0xFFFFFFFF
         if name == "_pyU32Wrap":
@@ -206,18 +819,67 @@ def run_hir_program(
         if entry_tid is None:
             raise RuntimeError(f"entry event type not found: {entry_event_type}")
 
+    limits_by_tid: dict[int, QueueLimit] = {}
+    for name, lim in (queue_limits or {}).items():
+        tid = find_type_id(name)
+        if tid is None:
+            raise RuntimeError(f"queue limit event type not found: {name}")
+        if lim.capacity < 1:
+            raise RuntimeError(f"queue limit capacity must be positive: {name}")
+        if lim.policy not in QUEUE_POLICIES:
+            raise RuntimeError(f"unknown queue policy for {name}: {lim.policy}")
+        limits_by_tid[tid] = lim
+
+    priority_by_tid: dict[int, int] = {}
+    for name, prio in (event_priorities or {}).items():
+        tid = find_type_id(name)
+        if tid is None:
+            raise RuntimeError(f"event priority type not found: {name}")
+        if prio < 1:
+            raise RuntimeError(f"event priority must be positive: {name}")
+        priority_by_tid[tid] = prio
+
+    batch_by_tid: dict[int, int] = {}
+    for name, size in (batch_sizes or {}).items():
+        tid = find_type_id(name)
+        if tid is None:
+            raise RuntimeError(f"batch size event type not found: {name}")
+        if size < 1:
+            raise RuntimeError(f"batch size must be positive: {name}")
+        batch_by_tid[tid] = size
+
+    sector_sym_by_name: dict[str, SymbolId] = {s.name: s.id for s in res.symbols if s.kind == SymbolKind.SECTOR}
+    weight_by_sector: dict[SymbolId, int] = {}
+    for name, weight in (sector_weights or {}).items():
+        sec_sym = sector_sym_by_name.get(name)
+        if sec_sym is None:
+            raise RuntimeError(f"sector weight target not found: {name}")
+        if weight < 1:
+            raise RuntimeError(f"sector weight must be positive: {name}")
+        weight_by_sector[sec_sym] = weight
+
+    for opt_name, opt in (
+        ("preempt_budget", preempt_budget),
+        ("max_steps", max_steps),
+        ("handler_step_budget", handler_step_budget),
+    ):
+        if opt is not None and opt < 1:
+            raise RuntimeError(f"{opt_name} must be positive")
+
     # Init sector state (populated after eval_expr is defined below).
     sector_state: dict[SymbolId, dict[SymbolId, Any]] = {}
 
     # Event loop structures.
     # - events_by_type: queued events by TypeId.
     # - waiting: suspended tasks waiting for a TypeId.
-    # - runnable: tasks ready to run.
+    # - runnable: tasks ready to run (per-sector queues when sector weights are set).
+    # - dispatch_order: event types with queued events, in dispatch order.
+    # - blocked_emits: tasks (with their pending event) parked on a full queue.
     events_by_type: dict[int, deque[Any]] = {}
     waiting: dict[int, deque[_Task]] = {}
-    runnable: deque[_Task] = deque()
-    event_type_heap: list[int] = []
-    event_type_in_heap: set[int] = set()
+    blocked_emits: dict[int, deque[tuple[_Task, Any]]] = {}
+    runnable: deque[_Task] | _SectorRunQueue = _SectorRunQueue(weight_by_sector) if weight_by_sector else deque()
+    dispatch_order = _DispatchOrder(priority_by_tid)
 
     def deep_eq(a: Any, b: Any) -> bool:
         if type(a) != type(b):
@@ -266,6 +928,53 @@ def run_hir_program(
         env: dict[SymbolId, Any]
         env_event_types: dict[SymbolId, int]
         pending_send: Any = _NO_SEND
+        steps: int = 0
+
+    # Step accounting for the running slice. Yield points (loop back-edges and
+    # function entries) only do work once `steps` reaches `limit`, which is the
+    # nearest of the preemption budget and the remaining run/handler budgets.
+    @dataclass
+    class _Clock:
+        steps: int = 0
+        limit: float = float("inf")
+        task: _Task | None = None
+        run_steps: int = 0
+
+    clock = _Clock()
+
+    def begin_slice(task: _Task) -> None:
+        clock.steps = 0
+        clock.task = task
+        limit = float("inf")
+        if preempt_budget is not None:
+            limit = preempt_budget
+        if handler_step_budget is not None:
+            limit = min(limit, handler_step_budget - task.steps + 1)
+        if max_steps is not None:
+            limit = min(limit, max_steps - clock.run_steps + 1)
+        clock.limit = limit
+
+    def check_budgets(task: _Task | None, used: int) -> None:
+        if max_steps is not None and clock.run_steps + used > max_steps:
+            raise RuntimeError("runtime exceeded step limit")
+        if handler_step_budget is not None and task is not None and task.steps + used > handler_step_budget:
+            raise RuntimeError("handler exceeded step budget")
+
+    def end_slice(task: _Task) -> None:
+        used = clock.steps
+        clock.steps = 0
+        clock.task = None
+        clock.limit = float("inf")
+        check_budgets(task, used)
+        task.steps += used
+        clock.run_steps += used
+        if stats is not None:
+            stats.steps = clock.run_steps
+
+    def yield_point() -> Generator[Any, Any, None]:
+        check_budgets(clock.task, clock.steps)
+        if preempt_budget is not None and clock.steps >= preempt_budget:
+            yield ("yield",)
 
     def eval_expr_gen(
         e: Expr,
@@ -466,6 +1175,9 @@ def run_hir_program(
         gen = eval_expr_gen(e, env, current_sector, {})
         try:
             x = next(gen)
+            # Scheduler yields are meaningless outside a task; run straight through.
+            while x == ("yield",):
+                x = next(gen)
         except StopIteration as si:
             return si.value
         raise RuntimeError(f"unexpected runtime yield in pure expression: {x!r}")
@@ -522,6 +1234,17 @@ def run_hir_program(
                 tid = int(sym.owner)
                 if type_by_id.get(tid, "").startswith("Event."):
                     return tid
+            # Record events are usually built by helper fns declared `-> Event.X`.
+            fn = fn_by_sym.get(expr.callee.sym)
+            if fn is not None:
+                ret = fn.retType
+                tid = None
+                if isinstance(ret, TypeVar):
+                    tid = int(ret.id)
+                elif isinstance(ret, TypeApp):
+                    tid = int(ret.base)
+                if tid is not None and type_by_id.get(tid, "").startswith("Event."):
+                    return tid
         if isinstance(value, tuple) and len(value) == 2 and isinstance(value[0], str):
             return event_ctor_type_by_name.get(value[0])
         return None
@@ -550,6 +1273,7 @@ def run_hir_program(
         env_event_types: dict[SymbolId, int],
     ) -> Generator[Any, Any, Any]:
         for st in b.stmts:
+            clock.steps += 1
             yield from exec_stmt_gen(st, env, current_sector, env_event_types)
         return None
 
@@ -596,9 +1320,14 @@ def run_hir_program(
             return
         if isinstance(st, ForStmt):
             it = (yield from eval_expr_gen(st.iterable, env, current_sector, env_event_types))
-            for x in list_to_py(it):
+            # Host-backed collections (`Vector`, `Deque`, `Queue`) iterate their
+            # host array; everything else must be a `List`.
+            items = collections_host.wrapper_items(it)
+            for x in list_to_py(it) if items is None else items:
                 env[st.binder] = x
                 yield from exec_block_gen(st.body, env, current_sector, env_event_types)
+                if clock.steps >= clock.limit:
+                    yield from yield_point()
             return
         if isinstance(st, MatchStmt):
             scr = (yield from eval_expr_gen(st.scrutinee, env, current_sector, env_event_types))
@@ -631,6 +1360,7 @@ def run_hir_program(
         if isinstance(st, StopStmt):
             raise StopProgram()
         if isinstance(st, YieldStmt):
+            yield ("yield",)
             return
         if isinstance(st, ExprStmt):
             _ = (yield from eval_expr_gen(st.expr, env, current_sector, env_event_types))
@@ -647,6 +1377,8 @@ def run_hir_program(
         kwargs: dict[str, Any],
         current_sector: SymbolId | None,
     ) -> Generator[Any, Any, Any]:
+        if clock.steps >= clock.limit:
+            yield from yield_point()
         env: dict[SymbolId, Any] = {}
         env_event_types: dict[SymbolId, int] = {}
         ai = 0
@@ -676,20 +1408,169 @@ def run_hir_program(
         for h in sec.handlers:
             handlers_by_event.setdefault(h.eventType, []).append((h, sec.sym))
 
-    def enqueue_event(tid: int, value: Any) -> None:
+    # `when` guards are evaluated at dispatch time, before any task is allocated.
+    # Guards of the form `ev == <const>` / `ev.field == <const>` are indexed by
+    # the constant so keyed routers select their handlers with one dict lookup.
+    @dataclass
+    class _DispatchPlan:
+        handlers: list[tuple[HandlerDecl, SymbolId]]
+        always: list[int]
+        generic: list[int]
+        # field name (None = the whole event value) -> guard key -> handler positions
+        keyed: dict[str | None, dict[Any, list[int]]]
+
+    dispatch_plans: dict[int, _DispatchPlan] = {}
+
+    def _guard_value_key(v: Any) -> Any:
+        # Hashable key with the same equivalence as `deep_eq` for scalar/nullary values.
+        if isinstance(v, (bool, int, float, str, bytes)):
+            return (type(v), v)
+        if isinstance(v, tuple) and len(v) == 2 and isinstance(v[0], str) and v[1] == []:
+            return ("sum", v[0])
+        return None
+
+    def _guard_const_key(e: Expr) -> Any:
+        if isinstance(e, LitExpr):
+            return _guard_value_key(eval_expr(e, {}, None))
+        if isinstance(e, VarExpr) and e.sym in ctor_by_sym:
+            return _guard_value_key(make_sum(ctor_by_sym[e.sym], []))
+        return None
+
+    def _guard_subject_field(e: Expr, binder: SymbolId) -> tuple[bool, str | None]:
+        if isinstance(e, VarExpr) and e.sym == binder:
+            return True, None
+        if isinstance(e, MemberExpr) and isinstance(e.object, VarExpr) and e.object.sym == binder:
+            return True, e.field
+        return False, None
+
+    def _keyed_guard(h: HandlerDecl) -> tuple[str | None, Any] | None:
+        g = h.when
+        if h.binder is None or not isinstance(g, BinaryExpr) or g.op != "==":
+            return None
+        for subj, const in ((g.left, g.right), (g.right, g.left)):
+            ok, field = _guard_subject_field(subj, h.binder)
+            if not ok:
+                continue
+            key = _guard_const_key(const)
+            if key is not None:
+                return field, key
+        return None
+
+    def dispatch_plan(tid: int) -> _DispatchPlan:
+        plan = dispatch_plans.get(tid)
+        if plan is not None:
+            return plan
+        hs = handlers_by_event.get(tid, [])
+        plan = _DispatchPlan(handlers=hs, always=[], generic=[], keyed={})
+        for i, (h, _sec_sym) in enumerate(hs):
+            if h.when is None:
+                plan.always.append(i)
+                continue
+            kg = _keyed_guard(h)
+            if kg is None:
+                plan.generic.append(i)
+                continue
+            field, key = kg
+            plan.keyed.setdefault(field, {}).setdefault(key, []).append(i)
+        dispatch_plans[tid] = plan
+        return plan
+
+    def guard_accepts(h: HandlerDecl, sec_sym: SymbolId, ev: Any) -> bool:
+        genv: dict[SymbolId, Any] = {h.binder: ev} if h.binder is not None else {}
+        return bool(eval_expr(h.when, genv, sec_sym))
+
+    def select_positions(plan: _DispatchPlan, ev: Any, *, defer_generic: bool = False) -> list[int]:
+        """Program-order positions of the handlers whose guard accepts `ev`.
+
+        With `defer_generic`, handlers with a non-keyed guard are kept without
+        evaluating it; the caller checks the guard when the handler runs.
+        """
+        if not plan.generic and not plan.keyed:
+            return list(range(len(plan.handlers)))
+        picked = list(plan.always)
+        for i in plan.generic:
+            h, sec_sym = plan.handlers[i]
+            if defer_generic or guard_accepts(h, sec_sym, ev):
+                picked.append(i)
+        for field, table in plan.keyed.items():
+            if field is None:
+                subject = ev
+            elif isinstance(ev, dict):
+                subject = ev.get(field)
+            else:
+                raise RuntimeError("member access on non-record")
+            key = _guard_value_key(subject)
+            if key is not None:
+                picked.extend(table.get(key, ()))
+        # Keep program order among the selected handlers.
+        picked.sort()
+        return picked
+
+    def queue_stats(tid: int) -> QueueStats | None:
+        if stats is None:
+            return None
+        name = type_by_id.get(tid, str(tid))
+        qs = stats.queues.get(name)
+        if qs is None:
+            qs = QueueStats()
+            stats.queues[name] = qs
+        return qs
+
+    def _queue_append(tid: int, q: deque[Any], value: Any) -> None:
+        was_empty = not q
+        q.append(value)
+        qs = queue_stats(tid)
+        if qs is not None:
+            qs.enqueued += 1
+            qs.high_water = max(qs.high_water, len(q))
+        if was_empty:
+            dispatch_order.add(tid)
+
+    def enqueue_event(tid: int, value: Any, emitter: _Task | None = None) -> bool:
+        """Deliver or queue an event; returns False if `emitter` was parked (queue full)."""
         # Awaiters consume events first (FIFO). If no waiter exists, queue for dispatch.
         ws = waiting.get(tid)
         if ws:
             t = ws.popleft()
             t.pending_send = value
             runnable.append(t)
-            return
+            return True
         q = events_by_type.setdefault(tid, deque())
-        was_empty = not q
-        q.append(value)
-        if was_empty and tid not in event_type_in_heap:
-            heapq.heappush(event_type_heap, tid)
-            event_type_in_heap.add(tid)
+        lim = limits_by_tid.get(tid)
+        if lim is not None and len(q) >= lim.capacity:
+            qs = queue_stats(tid)
+            if lim.policy == "drop_newest":
+                if qs is not None:
+                    qs.dropped += 1
+                return True
+            if lim.policy == "drop_oldest":
+                q.popleft()
+                if qs is not None:
+                    qs.dropped += 1
+            elif lim.policy == "block":
+                if emitter is None:
+                    # Nothing to suspend (e.g. the entry event is seeded by the runtime).
+                    name = type_by_id.get(tid, str(tid))
+                    raise RuntimeError(f"event queue full: {name} (capacity={lim.capacity}, policy=block, no emitting task to block)")
+                if qs is not None:
+                    qs.blocked += 1
+                blocked_emits.setdefault(tid, deque()).append((emitter, value))
+                return False
+            else:
+                name = type_by_id.get(tid, str(tid))
+                raise RuntimeError(f"event queue full: {name} (capacity={lim.capacity})")
+        _queue_append(tid, q, value)
+        return True
+
+    def take_event(tid: int, q: deque[Any]) -> Any:
+        # Pop the oldest event; a slot opened up, so admit one blocked emitter (FIFO).
+        ev = q.popleft()
+        bs = blocked_emits.get(tid)
+        if bs:
+            t, value = bs.popleft()
+            _queue_append(tid, q, value)
+            runnable.append(t)
+        return ev
 
     def _advance_task(task: _Task) -> Any:
         if task.pending_send is _NO_SEND:
@@ -711,24 +1592,69 @@ def run_hir_program(
 
         return _Task(gen=_gen(), sector=sec_sym, env=env, env_event_types=env_event_types)
 
+    def make_batch_task(h: HandlerDecl, sec_sym: SymbolId, events: list[Any], check_guard: bool) -> _Task:
+        # One task runs the handler body once per event; locals do not leak between events.
+        # A deferred guard is evaluated just before each event, so it sees the
+        # sector state the previous events left behind.
+        env: dict[SymbolId, Any] = {}
+        env_event_types: dict[SymbolId, int] = {}
+
+        def _gen() -> Generator[Any, Any, Any]:
+            for ev_value in events:
+                if check_guard and not guard_accepts(h, sec_sym, ev_value):
+                    continue
+                env.clear()
+                env_event_types.clear()
+                if h.binder is not None:
+                    env[h.binder] = ev_value
+                    env_event_types[h.binder] = h.eventType
+                yield from exec_block_gen(h.body, env, sec_sym, env_event_types)
+            return None
+
+        return _Task(gen=_gen(), sector=sec_sym, env=env, env_event_types=env_event_types)
+
+    def dispatch_batch(tid: int, q: deque[Any], first: Any, size: int) -> None:
+        batch = [first]
+        while q and len(batch) < size:
+            batch.append(take_event(tid, q))
+        if not q:
+            dispatch_order.remove(tid)
+        qs = queue_stats(tid)
+        if qs is not None:
+            qs.dispatched += len(batch)
+            qs.batches += 1
+        plan = dispatch_plan(tid)
+        events_by_pos: dict[int, list[Any]] = {}
+        for ev in batch:
+            for i in select_positions(plan, ev, defer_generic=True):
+                events_by_pos.setdefault(i, []).append(ev)
+        generic = set(plan.generic)
+        for i in sorted(events_by_pos):
+            h, sec_sym = plan.handlers[i]
+            runnable.append(make_batch_task(h, sec_sym, events_by_pos[i], i in generic))
+
     def dispatch_one_event() -> bool:
-        # Deterministic: smallest type id first.
-        while event_type_heap:
-            tid = event_type_heap[0]
-            q = events_by_type.get(tid)
-            if not q:
-                heapq.heappop(event_type_heap)
-                event_type_in_heap.discard(tid)
-                continue
-            ev = q.popleft()
-            if not q:
-                heapq.heappop(event_type_heap)
-                event_type_in_heap.discard(tid)
-            # Schedule handlers in program order.
-            for h, sec_sym in handlers_by_event.get(tid, ()):
-                runnable.append(make_handler_task(h, sec_sym, ev))
+        # Deterministic: smallest type id first (within a priority lane).
+        tid = dispatch_order.select(events_by_type)
+        if tid is None:
+            return False
+        q = events_by_type[tid]
+        ev = take_event(tid, q)
+        size = batch_by_tid.get(tid, 1)
+        if size > 1:
+            dispatch_batch(tid, q, ev, size)
             return True
-        return False
+        if not q:
+            dispatch_order.remove(tid)
+        qs = queue_stats(tid)
+        if qs is not None:
+            qs.dispatched += 1
+        # Schedule handlers whose guard accepts the event, in program order.
+        plan = dispatch_plan(tid)
+        for i in select_positions(plan, ev):
+            h, sec_sym = plan.handlers[i]
+            runnable.append(make_handler_task(h, sec_sym, ev))
+        return True
 
     try:
         # Seed initial event.
@@ -738,28 +1664,42 @@ def run_hir_program(
             # If no entry event specified, just run nothing.
             return
 
-        steps = 0
         while True:
-            # If nothing runnable, try to dispatch a queued event.
-            if not runnable:
+            # If nothing runnable, dispatch queued events (an event whose
+            # guards reject it schedules nothing).
+            while not runnable:
                 if not dispatch_one_event():
                     return
 
             task = runnable.popleft()
 
+            begin_slice(task)
             try:
                 req = _advance_task(task)
             except StopProgram:
+                end_slice(task)
                 return
             except AbortHandler as ah:
                 raise RuntimeError(f"handler aborted: {ah.cause!r}")
             except StopIteration:
+                end_slice(task)
+                continue
+            end_slice(task)
+
+            if req == ("yield",):
+                if stats is not None:
+                    stats.yields += 1
+                # Let queued events in before resuming, so a long-running task
+                # cannot starve handlers of other sectors.
+                if not runnable:
+                    dispatch_one_event()
+                runnable.append(task)
                 continue
 
             if isinstance(req, tuple) and req and req[0] == "emit":
                 _, tid, val = req
-                enqueue_event(int(tid), val)
-                runnable.append(task)
+                if enqueue_event(int(tid), val, task):
+                    runnable.append(task)
                 continue
 
             if isinstance(req, tuple) and req and req[0] == "await":
@@ -768,10 +1708,9 @@ def run_hir_program(
                 # If an event is already queued, consume immediately.
                 q = events_by_type.get(tid)
                 if q:
-                    ev = q.popleft()
-                    if not q and event_type_heap and event_type_heap[0] == tid:
-                        heapq.heappop(event_type_heap)
-                        event_type_in_heap.discard(tid)
+                    ev = take_event(tid, q)
+                    if not q:
+                        dispatch_order.remove(tid)
                     task.pending_send = ev
                     runnable.append(task)
                 else:
@@ -780,12 +1719,18 @@ def run_hir_program(
 
             # Unknown yield: just keep running.
             runnable.append(task)
-
-            steps += 1
-            if steps > 100000:
-                raise RuntimeError("runtime exceeded step limit")
     except StopProgram:
         return
 
 
-__all__ = ["Bridge", "run_hir_program"]
+__all__ = [
+    "Bridge",
+    "DEFAULT_MAX_STEPS",
+    "DEFAULT_PREEMPT_BUDGET",
+    "QUEUE_POLICIES",
+    "QueueLimit",
+    "QueueStats",
+    "RuntimeStats",
+    "parse_queue_limit",
+    "run_hir_program",
+]
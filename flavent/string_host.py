@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+from typing import Iterable
+
+# Host-side string helpers for `stdlib/stringlib`.
+#
+# The scanning helpers keep the edge cases of the original Flavent
+# implementations: an empty needle/separator never loops, negative offsets are
+# clamped, and case mapping only touches ASCII letters.
+#
+# `StrBuilder` backs `stringlib.StringBuilder`. Builders are values: appending
+# returns a new builder and never changes what an older one builds. Builders
+# share one piece list; an append reuses it when the builder is the newest
+# view of the list (the usual linear use, amortized O(1)) and copies the used
+# prefix otherwise.
+
+
+class StrBuilder:
+    __slots__ = ("_parts", "_count", "_size")
+
+    def __init__(self, parts: list[str], count: int, size: int) -> None:
+        self._parts = parts
+        self._count = count
+        self._size = size
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, StrBuilder):
+            return NotImplemented
+        return self._size == other._size and self.build() == other.build()
+
+    def __hash__(self) -> int:
+        return hash(self.build())
+
+    def __repr__(self) -> str:
+        return f"StrBuilder({self.build()!r})"
+
+    def _owned_parts(self) -> list[str]:
+        if len(self._parts) == self._count:
+            return self._parts
+        return self._parts[: self._count]
+
+    def append(self, s: str) -> StrBuilder:
+        if not s:
+            return self
+        parts = self._owned_parts()
+        parts.append(s)
+        return StrBuilder(parts, self._count + 1, self._size + len(s))
+
+    def append_all(self, xs: Iterable[str]) -> StrBuilder:
+        add = [x for x in xs if x]
+        if not add:
+            return self
+        parts = self._owned_parts()
+        parts.extend(add)
+        return StrBuilder(parts, self._count + len(add), self._size + sum(map(len, add)))
+
+    def build(self) -> str:
+        if len(self._parts) == self._count:
+            return "".join(self._parts)
+        return "".join(self._parts[: self._count])
+
+
+def new_builder() -> StrBuilder:
+    return StrBuilder([], 0, 0)
+
+
+_ASCII_LOWER = str.maketrans({chr(c): chr(c + 32) for c in range(65, 91)})
+_ASCII_UPPER = str.maketrans({chr(c + 32): chr(c) for c in range(65, 91)})
+
+STRIP_BOTH = 0
+STRIP_LEFT = 1
+STRIP_RIGHT = 2
+
+
+def find(h: str, needle: str, start: int) -> int:
+    if not needle:
+        return start
+    return h.find(needle, max(0, start))
+
+
+def rfind(h: str, needle: str, end: int) -> int:
+    """Start of the last `needle` that ends at or before `end` (-1 if none)."""
+    end = max(0, min(len(h), end))
+    if not needle:
+        return end
+    return h.rfind(needle, 0, end)
+
+
+def split(s: str, sep: str) -> list[str]:
+    if not sep:
+        return [s]
+    return s.split(sep)
+
+
+def replace(s: str, old: str, new: str, count: int) -> str:
+    """Replace up to `count` occurrences (`count <= 0` replaces all)."""
+    if not old:
+        return s
+    if count <= 0:
+        return s.replace(old, new)
+    return s.replace(old, new, count)
+
+
+def strip(s: str, chars: str, mode: int) -> str:
+    if mode == STRIP_LEFT:
+        return s.lstrip(chars)
+    if mode == STRIP_RIGHT:
+        return s.rstrip(chars)
+    return s.strip(chars)
+
+
+def lower_ascii(s: str) -> str:
+    return s.lower() if s.isascii() else s.translate(_ASCII_LOWER)
+
+
+def upper_ascii(s: str) -> str:
+    return s.upper() if s.isascii() else s.translate(_ASCII_UPPER)
+
+
+__all__ = [
+    "STRIP_BOTH",
+    "STRIP_LEFT",
+    "STRIP_RIGHT",
+    "StrBuilder",
+    "find",
+    "lower_ascii",
+    "new_builder",
+    "replace",
+    "rfind",
+    "split",
+    "strip",
+    "upper_ascii",
+]
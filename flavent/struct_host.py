@@ -0,0 +1,202 @@
+from __future__ import annotations
+
+import struct
+from dataclasses import dataclass
+from functools import cached_property, lru_cache
+from typing import Sequence
+
+# Host-side packing for `stdlib/struct`.
+#
+# Formats are compiled once per distinct string into native `struct.Struct`
+# segments (one per run of the same byte order) and cached; a compiled format
+# takes memory in proportion to the format string, never to its counts. The dialect keeps
+# the quirks of the original Flavent interpreter:
+# - codes are `B` (u8), `H` (u16), `I` (u32) and `x` (one zero pad byte),
+#   little-endian unless switched by `<` / `>`, which may appear anywhere
+# - a count of 0 means 1; a count with no code after it is "dangling count"
+# - packed values are wrapped to the field width, never rejected
+# - `unpack` checks the buffer before each B/H/I field ("buffer too small for
+#   H"); pad bytes are not checked, and negative offsets read as zero bytes
+# - errors are reported in format order, so "not enough values" wins over a
+#   format error that comes after the missing value
+
+CACHE_SIZE = 256
+# Longer format strings are compiled on every call instead of being cached, so
+# the cache never holds more than CACHE_SIZE short entries.
+CACHE_MAX_FORMAT = 256
+
+_SIZES = {"B": 1, "H": 2, "I": 4, "x": 1}
+_MASKS = {"B": 0xFF, "H": 0xFFFF, "I": 0xFFFFFFFF}
+
+
+@dataclass(frozen=True)
+class _Segment:
+    st: struct.Struct
+    # `(mask, count)` per value-taking field, so "1000000B" is one entry.
+    runs: tuple[tuple[int, int], ...]
+    nvalues: int
+
+    def pack(self, values: Sequence[int], pos: int) -> bytes:
+        args: list[int] = []
+        for mask, count in self.runs:
+            args.extend([int(v) & mask for v in values[pos : pos + count]])
+            pos += count
+        return self.st.pack(*args)
+
+
+@dataclass(frozen=True)
+class CompiledFormat:
+    """Parsed format: fields up to the first error, plus that error.
+
+    `ops` holds `(byteorder, code, count)` fields. When `error` is set,
+    `error_need` is the number of values `pack` must be given to reach it.
+    """
+
+    ops: tuple[tuple[str, str, int], ...]
+    nvalues: int
+    size: int
+    error: str | None
+    error_need: int
+
+    @cached_property
+    def segments(self) -> tuple[_Segment, ...]:
+        """Native `struct.Struct` segments, built on first use (after the value checks)."""
+        return _segments(self.ops)
+
+
+def _segments(ops: Sequence[tuple[str, str, int]]) -> tuple[_Segment, ...]:
+    out: list[_Segment] = []
+    order = ""
+    parts: list[str] = []
+    runs: list[tuple[int, int]] = []
+
+    def flush() -> None:
+        if parts:
+            nvalues = sum(count for _, count in runs)
+            out.append(_Segment(struct.Struct(order + "".join(parts)), tuple(runs), nvalues))
+
+    for byteorder, code, count in ops:
+        if byteorder != order:
+            flush()
+            order, parts, runs = byteorder, [], []
+        parts.append(f"{count}{code}")
+        if code != "x":
+            runs.append((_MASKS[code], count))
+    flush()
+    return tuple(out)
+
+
+def compile_format(fmt: str) -> CompiledFormat:
+    """Compile `fmt`; memory is proportional to the format string, not to its counts."""
+    if len(fmt) > CACHE_MAX_FORMAT:
+        return _compile(fmt)
+    return _compile_cached(fmt)
+
+
+def _compile(fmt: str) -> CompiledFormat:
+    ops: list[tuple[str, str, int]] = []
+    order = "<"
+    nvalues = 0
+    size = 0
+    error: str | None = None
+    error_need = 0
+    i, n = 0, len(fmt)
+    while i < n:
+        c = fmt[i]
+        if c == "<" or c == ">":
+            order = c
+            i += 1
+            continue
+        j = i
+        while j < n and "0" <= fmt[j] <= "9":
+            j += 1
+        count = max(1, int(fmt[i:j] or "0"))
+        if j >= n:
+            error, error_need = "dangling count", nvalues
+            break
+        code = fmt[j]
+        if code not in _SIZES:
+            # The original interpreter takes a value before rejecting the code.
+            error, error_need = "unsupported format", nvalues + 1
+            break
+        ops.append((order, code, count))
+        if code != "x":
+            nvalues += count
+        size += count * _SIZES[code]
+        i = j + 1
+    return CompiledFormat(tuple(ops), nvalues, size, error, error_need)
+
+
+_compile_cached = lru_cache(maxsize=CACHE_SIZE)(_compile)
+
+
+def calcsize(fmt: str) -> int:
+    cf = compile_format(fmt)
+    if cf.error is not None:
+        raise ValueError(cf.error)
+    return cf.size
+
+
+def pack(fmt: str, values: Sequence[int]) -> bytes:
+    """Raises ValueError with the interpreter's message on bad input."""
+    cf = compile_format(fmt)
+    k = len(values)
+    if cf.error is not None:
+        raise ValueError("not enough values" if k < cf.error_need else cf.error)
+    if k < cf.nvalues:
+        raise ValueError("not enough values")
+    if k > cf.nvalues:
+        raise ValueError("too many values")
+    if len(cf.segments) == 1:
+        return cf.segments[0].pack(values, 0)
+    out = bytearray()
+    pos = 0
+    for seg in cf.segments:
+        out += seg.pack(values, pos)
+        pos += seg.nvalues
+    return bytes(out)
+
+
+def _read(b: bytes, off: int, size: int) -> bytes:
+    if off >= 0:
+        return b[off : off + size]
+    return bytes(b[i] if 0 <= i < len(b) else 0 for i in range(off, off + size))
+
+
+def unpack_from(fmt: str, b: bytes, offset: int) -> list[int]:
+    """Raises ValueError with the interpreter's message on bad input."""
+    cf = compile_format(fmt)
+    if cf.error is None and offset >= 0 and len(b) >= offset + cf.size:
+        out: list[int] = []
+        off = offset
+        for seg in cf.segments:
+            out.extend(seg.st.unpack_from(b, off))
+            off += seg.st.size
+        return out
+    out = []
+    off = offset
+    for byteorder, code, count in cf.ops:
+        if code == "x":
+            off += count
+            continue
+        size = _SIZES[code]
+        st = struct.Struct(byteorder + code)
+        for _ in range(count):
+            if len(b) < off + size:
+                raise ValueError(f"buffer too small for {code}")
+            out.append(st.unpack(_read(b, off, size))[0])
+            off += size
+    if cf.error is not None:
+        raise ValueError(cf.error)
+    return out
+
+
+__all__ = [
+    "CACHE_MAX_FORMAT",
+    "CACHE_SIZE",
+    "CompiledFormat",
+    "calcsize",
+    "compile_format",
+    "pack",
+    "unpack_from",
+]
@@ -3,14 +3,14 @@ from __future__ import annotations
 from dataclasses import dataclass
 from pathlib import Path
 import sys
-from typing import Optional
+from typing import Mapping, Optional
 
 from flavent.lexer import lex
 from flavent.parser import parse_program
 from flavent.resolve import resolve_program_with_stdlib
 from flavent.lower import lower_resolved
 from flavent.typecheck import check_program
-from flavent.runtime import Bridge, run_hir_program
+from flavent.runtime import DEFAULT_MAX_STEPS, DEFAULT_PREEMPT_BUDGET, Bridge, QueueLimit, RuntimeStats, run_hir_program
 
 
 @dataclass(frozen=True)
@@ -101,7 +101,20 @@ def run_file(
     entry_event_type: str = "Event.Test",
     bridge: Bridge | None = None,
     case: str | None = None,
+    queue_limits: Mapping[str, QueueLimit] | None = None,
+    event_priorities: Mapping[str, int] | None = None,
+    sector_weights: Mapping[str, int] | None = None,
+    batch_sizes: Mapping[str, int] | None = None,
+    stats: RuntimeStats | None = None,
+    preempt_budget: int | None = DEFAULT_PREEMPT_BUDGET,
+    max_steps: int | None = DEFAULT_MAX_STEPS,
+    handler_step_budget: int | None = None,
 ) -> RunResult:
+    """Run one flvtest file (or one `case` of it).
+
+    The runtime options (`queue_limits`, `event_priorities`, `sector_weights`,
+    `batch_sizes`, `stats` and the step budgets) are passed through to `run_hir_program` and share its defaults.
+    """
     # The Flavent runtime interpreter is recursive (stdlib helpers are often recursive too).
     # Bump recursion limit to avoid spurious RecursionError in runtime tests.
     try:
@@ -118,7 +131,20 @@ def run_file(
         res = resolve_program_with_stdlib(prog, use_stdlib=True)
         hir = lower_resolved(res)
         check_program(hir, res)
-        run_hir_program(hir, res, entry_event_type=entry_event_type, bridge=bridge)
+        run_hir_program(
+            hir,
+            res,
+            entry_event_type=entry_event_type,
+            bridge=bridge,
+            queue_limits=queue_limits,
+            event_priorities=event_priorities,
+            sector_weights=sector_weights,
+            batch_sizes=batch_sizes,
+            stats=stats,
+            preempt_budget=preempt_budget,
+            max_steps=max_steps,
+            handler_step_budget=handler_step_budget,
+        )
         return RunResult(ok=True)
     except Exception as e:
         return RunResult(ok=False, error=str(e))
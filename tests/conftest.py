@@ -1 +1,53 @@
+from __future__ import annotations
+
+from typing import Any, Callable
+
+import pytest
+
+from flavent.lexer import lex
+from flavent.lower import lower_resolved
+from flavent.parser import parse_program
+from flavent.resolve import resolve_program_with_stdlib
+from flavent.runtime import Bridge, run_hir_program
+from flavent.typecheck import check_program
+
 pytest_plugins = ["flvtest.pytest_plugin"]
+
+
+class ConsoleBridge(Bridge):
+    """Collects `consolePrintln` output; `host` (anything with `handles`/`call`,
+    like `FileHandles`) serves the other calls it claims."""
+
+    def __init__(self, host: Any = None) -> None:
+        self.host = host
+        self.out: list[str] = []
+
+    def call(self, name: str, args: list[Any]) -> Any:
+        if name == "consolePrintln":
+            self.out.append(str(args[0]))
+            return None
+        if self.host is not None and self.host.handles(name):
+            return self.host.call(name, args)
+        raise RuntimeError(f"unexpected bridge call: {name}")
+
+
+def _compile(src: str):
+    prog = parse_program(lex("test.flv", src))
+    res = resolve_program_with_stdlib(prog, use_stdlib=True)
+    hir = lower_resolved(res)
+    check_program(hir, res)
+    return hir, res
+
+
+@pytest.fixture
+def run_flv() -> Callable[..., list[str]]:
+    """Compile a program against the stdlib, run it from `Event.Test` and
+    return its console lines."""
+
+    def run(src: str, *, host: Any = None) -> list[str]:
+        hir, res = _compile(src)
+        bridge = ConsoleBridge(host)
+        run_hir_program(hir, res, entry_event_type="Event.Test", bridge=bridge)
+        return bridge.out
+
+    return run
@@ -66,3 +66,26 @@ def test_bridge_warning_issues_include_code_and_metadata():
     assert "deprecated bridge shim used" in w["message"]
     assert w["location"]["file"] == "x.flv"
     assert w["metadata"]["count"] == 2
+
+
+def test_bridge_audit_hashlib_sha256_uses_no_deprecated_shims():
+    src = """use hashlib
+
+type Event.X = {}
+
+sector s:
+  on Event.X -> do:
+    let _h = sha256Hex(b"hi")
+    stop()
+
+run()
+"""
+
+    prog = parse_program(lex("test.flv", src))
+    res = resolve_program_with_stdlib(prog, use_stdlib=True)
+    hir = lower_resolved(res)
+    check_program(hir, res)
+
+    report = audit_bridge_usage(hir, res)
+    assert report["deprecated"] == {}
+    assert not any("_pySha256" in k for k in report["counts"])
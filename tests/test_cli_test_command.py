@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from flavent.cli import main
+
+
+_BURST_TESTS = """use flvtest
+
+type Event.Tick = T1 | T2 | T3
+
+test "burst" -> do:
+  emit T1()
+  emit T2()
+  emit T3()
+  assertTrue(true)?
+
+test "fails" -> do:
+  assertTrue(false)?
+"""
+
+
+@pytest.mark.integration
+def test_cli_test_runs_cases_and_reports_failures(tmp_path: Path, capsys):
+    src = tmp_path / "burst.flv"
+    src.write_text(_BURST_TESTS, encoding="utf-8")
+
+    assert main(["test", str(src)]) == 1
+    out = capsys.readouterr().out.splitlines()
+    assert out[0] == "PASS burst.flv::burst"
+    assert out[1].startswith("FAIL burst.flv::fails: ")
+
+    assert main(["test", str(src), "--case", "burst"]) == 0
+
+
+@pytest.mark.integration
+def test_cli_test_queue_limits_and_stats(tmp_path: Path, capsys):
+    src = tmp_path / "burst.flv"
+    src.write_text(_BURST_TESTS, encoding="utf-8")
+
+    rc = main(["test", str(src), "--case", "burst", "--queue-limit", "Event.Tick=1:drop_newest", "--stats"])
+    assert rc == 0
+    out = capsys.readouterr().out.splitlines()
+    assert out[0] == "PASS burst.flv::burst"
+    name, payload = out[1][len("STATS ") :].split(" ", 1)
+    assert name == "burst.flv::burst"
+    qs = json.loads(payload)["queues"]["Event.Tick"]
+    assert qs["dropped"] == 2
+    assert qs["high_water"] == 1
+
+    assert main(["test", str(src), "--case", "burst", "--queue-limit", "Event.Tick=1:fail"]) == 1
+    assert "event queue full: Event.Tick (capacity=1)" in capsys.readouterr().out
+
+    assert main(["test", str(src), "--queue-limit", "Event.Tick"]) == 2
+    assert capsys.readouterr().out.startswith("UsageError: invalid queue limit")
+
+
+_LANES = """use flvtest
+
+type Event.Test = {}
+type Event.Bulk = B1 | B2 | B3 | B4
+type Event.Ctl = C1 | C2 | C3
+
+sector main:
+  let order = ""
+  let seen = 0
+
+  on Event.Test -> do:
+    emit B1()
+    emit B2()
+    emit B3()
+    emit B4()
+    emit C1()
+    emit C2()
+    emit C3()
+
+  on Event.Bulk -> do:
+    order = order + "b"
+    check()?
+
+  on Event.Ctl -> do:
+    order = order + "c"
+    check()?
+
+  fn check() -> Result[Unit, Str] = do:
+    seen = seen + 1
+    if seen == 7:
+      assertEq(order, "cbccbbb")?
+      stop()
+    return Ok(())
+
+run()
+"""
+
+
+@pytest.mark.integration
+def test_cli_test_event_priorities_and_sector_weights(tmp_path: Path, capsys):
+    src = tmp_path / "lanes.flv"
+    src.write_text(_LANES, encoding="utf-8")
+
+    assert main(["test", str(src)]) == 1
+    assert "assertEq failed" in capsys.readouterr().out
+    assert main(["test", str(src), "--event-priority", "Event.Ctl=2", "--sector-weight", "main=3"]) == 0
+    assert capsys.readouterr().out == "PASS lanes.flv\n"
+
+    assert main(["test", str(src), "--event-priority", "Event.Nope=2"]) == 1
+    assert "event priority type not found: Event.Nope" in capsys.readouterr().out
+    assert main(["test", str(src), "--sector-weight", "nope=2"]) == 1
+    assert "sector weight target not found: nope" in capsys.readouterr().out
+
+    assert main(["test", str(src), "--event-priority", "Event.Ctl"]) == 2
+    assert capsys.readouterr().out.startswith("UsageError: invalid event priority")
+    assert main(["test", str(src), "--sector-weight", "main=x"]) == 2
+    assert capsys.readouterr().out.startswith("UsageError: invalid sector weight")
+
+
+_TICKS = """use flvtest
+
+type Event.Test = {}
+type Event.Tick = T1 | T2 | T3
+
+sector main:
+  let seen = 0
+
+  on Event.Test -> do:
+    emit T1()
+    emit T2()
+    emit T3()
+
+  on Event.Tick -> do:
+    seen = seen + 1
+    if seen == 3:
+      stop()
+
+run()
+"""
+
+
+@pytest.mark.integration
+def test_cli_test_batched_dispatch(tmp_path: Path, capsys):
+    src = tmp_path / "ticks.flv"
+    src.write_text(_TICKS, encoding="utf-8")
+
+    def tick_stats(*extra: str) -> dict:
+        assert main(["test", str(src), "--stats", *extra]) == 0
+        out = capsys.readouterr().out.splitlines()
+        assert out[0] == "PASS ticks.flv"
+        return json.loads(out[1].split(" ", 2)[2])["queues"]["Event.Tick"]
+
+    assert tick_stats()["batches"] == 0
+    qs = tick_stats("--batch", "Event.Tick=2")
+    assert qs["batches"] == 2
+    assert qs["dispatched"] == 3
+
+    assert main(["test", str(src), "--batch", "Event.Nope=2"]) == 1
+    assert "batch size event type not found: Event.Nope" in capsys.readouterr().out
+    assert main(["test", str(src), "--batch", "Event.Tick="]) == 2
+    assert capsys.readouterr().out.startswith("UsageError: invalid batch size")
+
+
+@pytest.mark.integration
+def test_cli_test_step_budgets(tmp_path: Path, capsys):
+    src = tmp_path / "loop.flv"
+    src.write_text(
+        """use flvtest
+
+test "loop" -> do:
+  for x in Cons(1, Cons(2, Cons(3, Nil))):
+    let _y = x
+  assertTrue(true)?
+""",
+        encoding="utf-8",
+    )
+
+    assert main(["test", str(src), "--max-steps", "5"]) == 1
+    assert "runtime exceeded step limit" in capsys.readouterr().out
+    assert main(["test", str(src), "--handler-step-budget", "3"]) == 1
+    assert "handler exceeded step budget" in capsys.readouterr().out
+    assert main(["test", str(src), "--max-steps", "0", "--preempt-budget", "0"]) == 0
@@ -388,6 +388,25 @@ for i in range(0, 15):
     )
 
 
+# Opaque host handles are not Ints.
+_TYPE_ERRS.append(
+    ErrCase(
+        name="type-opaque-bridge-handle-not-int",
+        src=(
+            "use hashlib\n"
+            "type Event.Test = {}\n"
+            "fn bump() -> Int = sha256Hasher().state + 1\n\n"
+            "sector main:\n"
+            "  on Event.Test -> do:\n"
+            "    stop()\n\n"
+            "run()\n"
+        ),
+        exc=TypeError,
+        msg_re=r"type mismatch",
+    )
+)
+
+
 _EFFECT_ERRS: list[ErrCase] = []
 
 # Direct bridge symbol usage should be rejected.
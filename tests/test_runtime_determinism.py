@@ -1,12 +1,14 @@
 from __future__ import annotations
 
+import inspect
+
 import pytest
 
 from flavent.lexer import lex
 from flavent.lower import lower_resolved
 from flavent.parser import parse_program
 from flavent.resolve import resolve_program_with_stdlib
-from flavent.runtime import Bridge, run_hir_program
+from flavent.runtime import DEFAULT_MAX_STEPS, DEFAULT_PREEMPT_BUDGET, Bridge, QueueLimit, RuntimeStats, run_hir_program
 from flavent.typecheck import check_program
 
 
@@ -201,3 +203,458 @@ run()
     hir, res = _compile(src)
     for _ in range(10):
         run_hir_program(hir, res, entry_event_type="Event.Ping", bridge=_CaptureConsoleBridge())
+
+
+@pytest.mark.integration
+def test_runtime_when_guards_select_handlers_in_program_order():
+    src = """use consoleIO
+
+type Event.Start = {}
+type Event.Msg = { kind: Int, body: Str }
+
+fn mk(k: Int) -> Event.Msg = { kind = k, body = "x" }
+
+sector main:
+  let limit = 3
+
+  on Event.Start -> do:
+    emit mk(2)
+    emit mk(1)
+    emit mk(7)
+
+  on Event.Msg as m when m.kind == 1 -> do:
+    call consoleIO.println("one")
+
+  on Event.Msg as m when 2 == m.kind -> do:
+    call consoleIO.println("two")
+
+  on Event.Msg as m when m.kind > limit -> do:
+    call consoleIO.println("big")
+
+  on Event.Msg as m -> do:
+    call consoleIO.println("all")
+
+run()
+"""
+
+    hir, res = _compile(src)
+    bridge = _CaptureConsoleBridge()
+    run_hir_program(hir, res, entry_event_type="Event.Start", bridge=bridge)
+    assert bridge.lines == [
+        "consolePrintln:two",
+        "consolePrintln:all",
+        "consolePrintln:one",
+        "consolePrintln:all",
+        "consolePrintln:big",
+        "consolePrintln:all",
+    ]
+
+
+@pytest.mark.integration
+def test_runtime_event_rejected_by_every_guard_is_skipped():
+    src = """use consoleIO
+
+type Event.Start = {}
+type Event.Msg = { kind: Int, body: Str }
+
+fn mk(k: Int) -> Event.Msg = { kind = k, body = "x" }
+
+sector main:
+  on Event.Start -> do:
+    emit mk(5)
+    emit mk(1)
+
+  on Event.Msg as m when m.kind == 1 -> do:
+    call consoleIO.println("one")
+
+run()
+"""
+
+    hir, res = _compile(src)
+    bridge = _CaptureConsoleBridge()
+    run_hir_program(hir, res, entry_event_type="Event.Start", bridge=bridge)
+    assert bridge.lines == ["consolePrintln:one"]
+
+
+@pytest.mark.integration
+def test_runtime_when_guards_keyed_on_sum_event_ctor():
+    keyed = "\n".join(
+        f"  on Event.Key as k when k == K{i} -> do:\n    call consoleIO.println(\"k{i}\")\n" for i in range(40)
+    )
+    ctors = " | ".join(f"K{i}" for i in range(40))
+    src = f"""use consoleIO
+
+type Event.Start = {{}}
+type Event.Key = {ctors}
+
+sector main:
+  on Event.Start -> do:
+    emit K17()
+    emit K3()
+
+{keyed}
+run()
+"""
+
+    hir, res = _compile(src)
+    bridge = _CaptureConsoleBridge()
+    run_hir_program(hir, res, entry_event_type="Event.Start", bridge=bridge)
+    assert bridge.lines == ["consolePrintln:k17", "consolePrintln:k3"]
+
+
+_BURST_SRC = """use consoleIO
+
+type Event.Start = {}
+type Event.Tick = T1 | T2 | T3 | T4 | T5
+
+sector producer:
+  on Event.Start -> do:
+    emit T1()
+    emit T2()
+    emit T3()
+    emit T4()
+    emit T5()
+    call consoleIO.println("produced")
+
+sector consumer:
+  on Event.Tick as t -> do:
+    match t:
+      T1 -> call consoleIO.println("t1")
+      T2 -> call consoleIO.println("t2")
+      T3 -> call consoleIO.println("t3")
+      T4 -> call consoleIO.println("t4")
+      T5 -> call consoleIO.println("t5")
+
+run()
+"""
+
+
+@pytest.mark.integration
+@pytest.mark.parametrize(
+    "policy,expected,dropped",
+    [
+        ("block", ["t1", "t2", "produced", "t3", "t4", "t5"], 0),
+        ("drop_newest", ["produced", "t1", "t2"], 3),
+        ("drop_oldest", ["produced", "t4", "t5"], 3),
+    ],
+)
+def test_runtime_bounded_queue_policies(policy, expected, dropped):
+    hir, res = _compile(_BURST_SRC)
+    bridge = _CaptureConsoleBridge()
+    stats = RuntimeStats()
+    run_hir_program(
+        hir,
+        res,
+        entry_event_type="Event.Start",
+        bridge=bridge,
+        queue_limits={"Event.Tick": QueueLimit(capacity=2, policy=policy)},
+        stats=stats,
+    )
+    assert bridge.lines == [f"consolePrintln:{x}" for x in expected]
+    qs = stats.queues["Event.Tick"]
+    assert qs.dropped == dropped
+    assert qs.high_water == 2
+    assert qs.enqueued == 5 - (dropped if policy == "drop_newest" else 0)
+    if policy == "block":
+        assert qs.blocked == 3
+
+
+@pytest.mark.integration
+def test_runtime_bounded_queue_fail_policy_and_config_errors():
+    hir, res = _compile(_BURST_SRC)
+    with pytest.raises(RuntimeError, match="event queue full: Event.Tick"):
+        run_hir_program(
+            hir,
+            res,
+            entry_event_type="Event.Start",
+            bridge=_CaptureConsoleBridge(),
+            queue_limits={"Event.Tick": QueueLimit(capacity=2, policy="fail")},
+        )
+    with pytest.raises(RuntimeError, match="unknown queue policy"):
+        run_hir_program(hir, res, entry_event_type="Event.Start", queue_limits={"Event.Tick": QueueLimit(2, "spill")})
+    with pytest.raises(RuntimeError, match="event type not found"):
+        run_hir_program(hir, res, entry_event_type="Event.Start", queue_limits={"Event.Nope": QueueLimit(2)})
+
+
+_LONG_LOOP_SRC = """use consoleIO
+use collections.list
+
+type Event.Start = {}
+type Event.Ping = Ping | PingAlt
+
+sector worker:
+  on Event.Start -> do:
+    for x in Cons(1, Cons(2, Cons(3, Cons(4, Nil)))):
+      call consoleIO.println("work")
+      YIELD
+
+sector watcher:
+  on Event.Start -> do:
+    call consoleIO.println("watch")
+    emit Ping()
+
+  on Event.Ping -> do:
+    call consoleIO.println("ping")
+
+run()
+"""
+
+
+@pytest.mark.integration
+def test_runtime_yield_hands_control_to_other_tasks_and_queued_events():
+    hir, res = _compile(_LONG_LOOP_SRC.replace("YIELD", "yield()"))
+    bridge = _CaptureConsoleBridge()
+    stats = RuntimeStats()
+    run_hir_program(hir, res, entry_event_type="Event.Start", bridge=bridge, stats=stats)
+    assert bridge.lines == [
+        "consolePrintln:work",
+        "consolePrintln:watch",
+        "consolePrintln:work",
+        "consolePrintln:work",
+        "consolePrintln:ping",
+        "consolePrintln:work",
+    ]
+    assert stats.yields == 4
+    assert stats.steps > 0
+
+
+@pytest.mark.integration
+def test_runtime_preempt_budget_yields_at_loop_back_edges():
+    hir, res = _compile(_LONG_LOOP_SRC.replace("YIELD", "let _y = 0"))
+    bridge = _CaptureConsoleBridge()
+    run_hir_program(hir, res, entry_event_type="Event.Start", bridge=bridge, preempt_budget=None)
+    assert bridge.lines == ["consolePrintln:work"] * 4 + ["consolePrintln:watch", "consolePrintln:ping"]
+
+    bridge = _CaptureConsoleBridge()
+    run_hir_program(hir, res, entry_event_type="Event.Start", bridge=bridge, preempt_budget=1)
+    # Function entries are yield points too, so the watcher is preempted as well.
+    assert bridge.lines == [
+        "consolePrintln:work",
+        "consolePrintln:watch",
+        "consolePrintln:work",
+        "consolePrintln:ping",
+        "consolePrintln:work",
+        "consolePrintln:work",
+    ]
+
+
+_RUNAWAY_SRC = """use consoleIO
+use array
+
+type Event.Start = {}
+type Event.Spin = Spin | Spun
+
+sector worker:
+  on Event.Start -> do:
+    for x in floatArrayToList(floatArrayFill(3000, 0.0)):
+      let _y = x
+    call consoleIO.println("worker-done")
+
+sector watcher:
+  on Event.Start -> do:
+    call consoleIO.println("watch")
+
+sector spinner:
+  on Event.Spin as e -> do:
+    emit e
+"""
+
+
+@pytest.mark.integration
+def test_runtime_preempts_long_loops_and_caps_runs_by_default():
+    hir, res = _compile(_RUNAWAY_SRC + "\nrun()\n")
+    bridge = _CaptureConsoleBridge()
+    run_hir_program(hir, res, entry_event_type="Event.Start", bridge=bridge)
+    assert bridge.lines == ["consolePrintln:watch", "consolePrintln:worker-done"]
+
+    bridge = _CaptureConsoleBridge()
+    run_hir_program(hir, res, entry_event_type="Event.Start", bridge=bridge, preempt_budget=None)
+    assert bridge.lines == ["consolePrintln:worker-done", "consolePrintln:watch"]
+
+    # An event cycle that never stops hits the run cap instead of hanging
+    # (the default cap is finite; a smaller one keeps the test fast).
+    params = inspect.signature(run_hir_program).parameters
+    assert params["max_steps"].default == DEFAULT_MAX_STEPS
+    assert params["preempt_budget"].default == DEFAULT_PREEMPT_BUDGET
+    src = _RUNAWAY_SRC.replace('call consoleIO.println("watch")', "emit Spin()")
+    hir, res = _compile(src + "\nrun()\n")
+    with pytest.raises(RuntimeError, match="runtime exceeded step limit"):
+        run_hir_program(hir, res, entry_event_type="Event.Start", bridge=_CaptureConsoleBridge(), max_steps=20_000)
+
+
+@pytest.mark.integration
+def test_runtime_step_budgets_are_enforced():
+    hir, res = _compile(_LONG_LOOP_SRC.replace("YIELD", "let _y = 0"))
+    run_hir_program(hir, res, entry_event_type="Event.Start", bridge=_CaptureConsoleBridge(), max_steps=100)
+    with pytest.raises(RuntimeError, match="runtime exceeded step limit"):
+        run_hir_program(hir, res, entry_event_type="Event.Start", bridge=_CaptureConsoleBridge(), max_steps=5)
+    with pytest.raises(RuntimeError, match="handler exceeded step budget"):
+        run_hir_program(hir, res, entry_event_type="Event.Start", bridge=_CaptureConsoleBridge(), handler_step_budget=4)
+    with pytest.raises(RuntimeError, match="preempt_budget must be positive"):
+        run_hir_program(hir, res, entry_event_type="Event.Start", preempt_budget=0)
+
+
+_LANES_SRC = """use consoleIO
+
+type Event.Start = {}
+type Event.Bulk = B1 | B2 | B3 | B4
+type Event.Ctl = C1 | C2 | C3
+
+sector main:
+  on Event.Start -> do:
+    emit B1()
+    emit B2()
+    emit B3()
+    emit B4()
+    emit C1()
+    emit C2()
+    emit C3()
+
+  on Event.Bulk -> do:
+    call consoleIO.println("bulk")
+
+  on Event.Ctl -> do:
+    call consoleIO.println("ctl")
+
+run()
+"""
+
+
+@pytest.mark.integration
+def test_runtime_priority_lanes_use_weighted_fair_selection():
+    hir, res = _compile(_LANES_SRC)
+    bridge = _CaptureConsoleBridge()
+    run_hir_program(hir, res, entry_event_type="Event.Start", bridge=bridge)
+    assert [x.split(":")[1] for x in bridge.lines] == ["bulk"] * 4 + ["ctl"] * 3
+
+    bridge = _CaptureConsoleBridge()
+    stats = RuntimeStats()
+    run_hir_program(
+        hir,
+        res,
+        entry_event_type="Event.Start",
+        bridge=bridge,
+        event_priorities={"Event.Ctl": 2},
+        stats=stats,
+    )
+    assert [x.split(":")[1] for x in bridge.lines] == ["ctl", "bulk", "ctl", "ctl", "bulk", "bulk", "bulk"]
+    assert stats.queues["Event.Ctl"].dispatched == 3
+    assert stats.queues["Event.Bulk"].dispatched == 4
+
+
+@pytest.mark.integration
+def test_runtime_sector_weights_share_scheduler_slices():
+    src = """use consoleIO
+use collections.list
+
+type Event.Start = {}
+
+sector fast:
+  on Event.Start -> do:
+    for x in Cons(1, Cons(2, Cons(3, Cons(4, Nil)))):
+      call consoleIO.println("fast")
+      yield()
+
+sector slow:
+  on Event.Start -> do:
+    for x in Cons(1, Cons(2, Cons(3, Cons(4, Nil)))):
+      call consoleIO.println("slow")
+      yield()
+
+run()
+"""
+
+    hir, res = _compile(src)
+    bridge = _CaptureConsoleBridge()
+    run_hir_program(hir, res, entry_event_type="Event.Start", bridge=bridge, sector_weights={"fast": 2})
+    assert [x.split(":")[1] for x in bridge.lines] == [
+        "fast", "slow", "fast", "fast", "slow", "fast", "slow", "slow",
+    ]
+    with pytest.raises(RuntimeError, match="sector weight target not found"):
+        run_hir_program(hir, res, entry_event_type="Event.Start", sector_weights={"nope": 2})
+
+
+@pytest.mark.integration
+def test_runtime_batched_dispatch_runs_handler_over_drained_events():
+    src = """use consoleIO
+
+type Event.Start = {}
+type Event.Tick = T1 | T2 | T3 | T4 | T5
+
+sector main:
+  let seen = 0
+
+  on Event.Start -> do:
+    emit T1()
+    emit T2()
+    emit T3()
+    emit T4()
+    emit T5()
+
+  on Event.Tick as t -> do:
+    seen = seen + 1
+    match t:
+      T1 -> call consoleIO.println("a1")
+      T2 -> call consoleIO.println("a2")
+      T3 -> call consoleIO.println("a3")
+      T4 -> call consoleIO.println("a4")
+      T5 -> call consoleIO.println("a5")
+
+  on Event.Tick as t when t == T2 -> do:
+    call consoleIO.println("b2")
+
+run()
+"""
+
+    hir, res = _compile(src)
+    bridge = _CaptureConsoleBridge()
+    stats = RuntimeStats()
+    run_hir_program(
+        hir,
+        res,
+        entry_event_type="Event.Start",
+        bridge=bridge,
+        batch_sizes={"Event.Tick": 3},
+        stats=stats,
+    )
+    assert [x.split(":")[1] for x in bridge.lines] == ["a1", "a2", "a3", "b2", "a4", "a5"]
+    qs = stats.queues["Event.Tick"]
+    assert qs.dispatched == 5
+    assert qs.batches == 2
+
+
+@pytest.mark.integration
+def test_runtime_batched_dispatch_evaluates_state_guards_per_event():
+    src = """use consoleIO
+
+type Event.Start = {}
+type Event.Tick = T1 | T2 | T3 | T4
+
+sector main:
+  let budget = 2
+
+  on Event.Start -> do:
+    emit T1()
+    emit T2()
+    emit T3()
+    emit T4()
+
+  on Event.Tick as t when budget > 0 -> do:
+    budget = budget - 1
+    call consoleIO.println("took")
+
+  on Event.Tick as t when t == T4 -> do:
+    call consoleIO.println("last")
+
+run()
+"""
+
+    hir, res = _compile(src)
+    outputs = []
+    for batch_sizes in (None, {"Event.Tick": 4}):
+        bridge = _CaptureConsoleBridge()
+        run_hir_program(hir, res, entry_event_type="Event.Start", bridge=bridge, batch_sizes=batch_sizes)
+        outputs.append([x.split(":")[1] for x in bridge.lines])
+    # The guard reads sector state, so it must see the decrements of earlier events.
+    assert outputs[0] == ["took", "took", "last"]
+    assert outputs[1] == outputs[0]
@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+from flavent.collections_host import new_deque, new_vector, wrapper_items
+
+
+def test_stdlib_vector_for_loop_iterates_items(run_flv):
+    src = """use collections.vector
+use collections.deque
+use collections.list
+use consoleIO
+
+type Event.Test = {}
+
+sector main:
+  on Event.Test -> do:
+    let v = vectorPush(vectorFromList(Cons("a", Cons("b", Nil))), "c")
+    for x in vectorSet(v, 0, "z"):
+      call consoleIO.println("v " + x)
+    for x in dequePushFront(dequeFromList(Cons("y", Nil)), "x"):
+      call consoleIO.println("d " + x)
+    for x in vectorEmpty():
+      call consoleIO.println("never " + x)
+    stop()
+
+run()
+"""
+    assert run_flv(src) == ["v z", "v b", "v c", "d x", "d y"]
+
+
+def test_stdlib_host_collection_records_are_recognized_by_layout_and_host_type():
+    vec = new_vector(["a", "b"])
+    assert wrapper_items({"buf": vec, "last": ("Some", ["b"])}) == ["a", "b"]
+    assert wrapper_items({"buf": new_deque(["x"]), "first": ("Some", ["x"])}) == ["x"]
+    # Other records with a `buf` field are left to the `List` path.
+    assert wrapper_items({"buf": vec}) is None
+    assert wrapper_items({"buf": vec, "last": ("None", []), "pos": 0}) is None
+    assert wrapper_items({"buf": vec, "first": ("None", [])}) is None
+    assert wrapper_items({"buf": "a,b", "last": ("None", [])}) is None
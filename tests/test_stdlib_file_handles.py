@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from flavent.file_host import FileHandles
+
+
+@pytest.fixture
+def run_files(run_flv):
+    files = FileHandles()
+    yield lambda src: run_flv(src, host=files)
+    files.close_all()
+
+
+_LINE_LOOP = """use file
+use consoleIO
+use stringlib
+use collections.list
+use std.result
+
+type Event.Test = {}
+
+sector main:
+  fn drain(h: FileHandle) -> Result[Unit, Str] = do:
+    let batch = rpc file.readLineBatch(h, 2)?
+    return match batch:
+      Nil -> Ok(())
+      Cons(_, _) -> do:
+        for line in batch:
+          call consoleIO.println("[" + line + "]")
+        return drain(h)
+
+  on Event.Test -> do:
+    let h = rpc file.OPEN("PATH")?
+    let first = rpc file.nextLine(h)?
+    match first:
+      Some(s) -> call consoleIO.println("first " + s)
+      None -> call consoleIO.println("empty")
+    let _d = drain(h)?
+    let last = rpc file.nextLine(h)?
+    match last:
+      Some(s) -> call consoleIO.println("more " + s)
+      None -> call consoleIO.println("eof")
+    let _c = rpc file.closeHandle(h)?
+    stop()
+
+run()
+"""
+
+
+def test_file_handle_reads_lines_in_batches(tmp_path: Path, run_files):
+    p = tmp_path / "log.txt"
+    p.write_bytes("head\nalpha\r\n\nbeta\ncafé".encode("utf-8"))
+    for opener in ("open", "openMmap"):
+        out = run_files(_LINE_LOOP.replace("OPEN", opener).replace("PATH", str(p)))
+        assert out == ["first head", "[alpha\r]", "[]", "[beta]", "[café]", "eof"], opener
+
+
+def test_file_handle_chunks_feed_csv_stream(tmp_path: Path, run_files):
+    src_path = tmp_path / "in.csv"
+    out_path = tmp_path / "out.bin"
+    src_path.write_text('id,note\n1,"two\nlines"\n2,é', encoding="utf-8")
+    src = f"""use file
+use bytelib
+use csv
+use csv.stream
+use consoleIO
+use stringlib
+use collections.list
+use std.result
+
+type Event.Test = {{}}
+
+sector main:
+  fn pump(h: FileHandle, r: CsvReader) -> Result[List[List[Str]], Str] = do:
+    let chunk = rpc file.readChunk(h, 5)?
+    return match bytesLen(chunk) == 0:
+      true -> csvReaderClose(r)
+      false -> do:
+        let step = csvReaderFeed(r, chunk)?
+        for row in step.rows:
+          call consoleIO.println(join(row, "|"))
+        return pump(h, step.reader)
+
+  on Event.Test -> do:
+    let h = rpc file.open("{src_path}")?
+    let rest = pump(h, csvReader())?
+    call consoleIO.println("rest " + csvStringify(rest))
+    let _c = rpc file.closeHandle(h)?
+    let w = rpc file.openWrite("{out_path}")?
+    let _w1 = rpc file.write(w, b"ab")?
+    let _w2 = rpc file.write(w, b"\\x00c")?
+    let _c2 = rpc file.closeHandle(w)?
+    stop()
+
+run()
+"""
+    out = run_files(src)
+    assert out == ["id|note", "1|two\nlines", "rest 2,é"]
+    assert out_path.read_bytes() == b"ab\x00c"
+
+
+def test_file_handles_errors_and_empty_mmap(tmp_path: Path):
+    files = FileHandles()
+    empty = tmp_path / "empty"
+    empty.write_bytes(b"")
+    h = files.open_mmap(str(empty))
+    assert files.read_lines(h, 10) == []
+    text = tmp_path / "text"
+    text.write_bytes(b"a\nb\n")
+    t = files.open(str(text), "r")
+    assert files.read_lines(t, 0) == []
+    assert files.read_lines(t, -3) == []
+    assert files.read_lines(t, 1) == ["a"]
+    assert files.read_chunk(h, 10) == b""
+    assert files.call("fsWrite", [h, b"x"]) == ("Err", ["file opened read-only (mmap)"])
+    assert files.call("fsClose", [h]) == ("Ok", [()])
+    assert files.call("fsClose", [h]) == ("Err", [f"invalid file handle: {h}"])
+    assert files.call("fsOpen", [str(empty), "rw"]) == ("Err", ["invalid file mode: rw"])
+    tag, payload = files.call("fsOpen", [str(tmp_path / "missing"), "r"])
+    assert tag == "Err" and payload[0]
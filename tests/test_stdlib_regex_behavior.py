@@ -87,3 +87,90 @@ def test_regex_replace_tokens_and_capture_order():
     assertEq(findFirstCaptures(compile("(ab)(cd)"), "zzabcdyy"), Some(Cons("abcd", Cons("ab", Cons("cd", Nil)))))?
 """
     _run_ok(body, uses="use regex\n")
+
+
+def test_regex_replace_all_keeps_text_skipped_after_empty_match():
+    body = """    assertEq(replaceAll(compile("x*"), "ab", "-"), "-a-b-")?
+    assertEq(replaceAllBacktrack(compile("x*"), "ab", "-"), "-a-b-")?
+"""
+    _run_ok(body, uses="use regex\n")
+
+
+@pytest.mark.parametrize(
+    ("pattern", "subject"),
+    [
+        ("a*?", "aa"),
+        ("(a|b)*c", "xababcz"),
+        ("((a)|b)*", "ab"),
+        ("(a|)*", "b"),
+        ("^a|b", "cb"),
+        ("a$|b", "ab a"),
+        ("\\bfo+\\b", "foo fooo-x"),
+        ("[]a]+", "]a]b"),
+        ("[^a-c\\d]+", "ab9zz1"),
+        ("[z-a]", "za"),
+        ("\\n.", "xnm"),
+        ("a**", "a*aa"),
+        ("(a", "x(a"),
+        ("a)", "a)"),
+        ("x^y", "x^y"),
+        ("(a(b)?)+?c", "aabac"),
+        ("\\d+|(\\w)(\\w)", "ab12"),
+    ],
+)
+def test_regex_host_engine_matches_backtracking_reference(pattern: str, subject: str):
+    p = _flv_str(pattern)
+    s = _flv_str(subject)
+    body = (
+        f"    let r = compile({p})\n"
+        f"    assertEq(isMatch(r, {s}), isMatchBacktrack(r, {s}))?\n"
+        f"    assertEq(findAllSpans(r, {s}), findAllSpansBacktrack(r, {s}))?\n"
+        f"    assertEq(findFirstCaptures(r, {s}), findFirstCapturesBacktrack(r, {s}))?\n"
+        f"    assertEq(replace(r, {s}, \"<$1|$0>\"), replaceBacktrack(r, {s}, \"<$1|$0>\"))?\n"
+        f"    assertEq(replaceAll(r, {s}, \"[$2]\"), replaceAllBacktrack(r, {s}, \"[$2]\"))?\n"
+    )
+    _run_ok(body, uses="use regex\n")
+
+
+def test_regex_host_compile_is_cached_per_pattern():
+    from flavent import regex_host
+
+    a = regex_host.compile_regex("(ab)+c")
+    assert regex_host.compile_regex("(ab)+c") is a
+    assert a.groups == 1
+    assert regex_host.compile_regex("^x$").pattern.pattern == "\\A(?:x\\Z)"
+
+
+def test_regex_set_agrees_with_single_patterns():
+    from flavent import regex_host
+
+    pats = ("a+b", "^x", "(c|d)$", "\\bfoo\\b", "z*", "[^a-z]", "q")
+    rs = regex_host.compile_regex_set(pats)
+    assert regex_host.compile_regex_set(pats) is rs
+    for s in ["", "aab", "xfoo d", "foo-bar", "x", "ABC", "food"]:
+        expected = [i for i, p in enumerate(pats) if regex_host.compile_regex(p).pattern.search(s)]
+        assert rs.matches(s) == expected
+        assert rs.is_match(s) == bool(expected)
+
+
+@pytest.mark.parametrize("max_states", [4096, 3])
+def test_regex_set_automaton_agrees_with_host_search(monkeypatch, max_states: int):
+    import random
+
+    from flavent import regex_host
+
+    monkeypatch.setattr(regex_host, "SET_MAX_STATES", max_states)
+    pats = [
+        "(a|b)*c", "^a|b", "a$|b", "\\bfo+\\b", "[]a]+", "[^a-c\\d]+", "[z-a]", "a**", "(a", "a)",
+        "x^y", "(a(b)?)+?c", "$", "^$", "\\b*x", "a\\b$", "(ab$|c)d", "^(a|b)+$", "[\\w-]", "\\s\\S",
+    ]
+    rng = random.Random(7)
+    for _ in range(300):
+        group = tuple(rng.sample(pats, rng.randint(1, 6)))
+        rs = regex_host.CompiledRegexSet(group, regex_host._SetAutomaton(group))
+        for _ in range(4):
+            s = "".join(rng.choice("abcxyz fo_1-$^()\n]") for _ in range(rng.randint(0, 10)))
+            expected = [i for i, p in enumerate(group) if regex_host.compile_regex(p).pattern.search(s)]
+            assert rs.matches(s) == expected, (group, s)
+            assert rs.is_match(s) == bool(expected)
+